@@ -4,9 +4,9 @@ MICRO-DRAMA MARKET INTELLIGENCE DASHBOARD v2.1
 Professional light theme with Google Sheets integration.
 
 SETUP:
-1. Create a Google Sheet with the tabs defined below
+1. Create a Google Sheet with the tabs defined in config.py
 2. Publish each sheet to web (File > Share > Publish to web > CSV)
-3. Paste the CSV URLs in the SHEET_URLS section below
+3. Paste the CSV URLs in the SHEET_URLS section of config.py
 4. Deploy!
 
 Author: Vinitha Nair
@@ -14,43 +14,28 @@ Author: Vinitha Nair
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
-
-# ============================================
-# GOOGLE SHEETS CONFIGURATION
-# ============================================
-# 
-# HOW TO SET UP YOUR GOOGLE SHEET:
-# 
-# 1. Create a new Google Sheet
-# 2. Create 4 tabs named exactly:
-#    - "platforms"
-#    - "titles" 
-#    - "genres"
-#    - "regions"
-#
-# 3. For each tab, go to: File > Share > Publish to web
-#    - Select the specific tab
-#    - Choose "Comma-separated values (.csv)"
-#    - Click Publish and copy the URL
-#
-# 4. Paste each URL below (replacing the empty strings)
-#
-# IMPORTANT: Every time you update the sheet, changes appear 
-# in your dashboard within ~5 minutes (Google's cache refresh)
-# ============================================
-
-SHEET_URLS = {
-    "platforms": "https://docs.google.com/spreadsheets/d/e/2PACX-1vT_-4nL7L0B90pPRqkI8rAIXcVr75A7wrg6T28cfZefl-ukGyW2pgqkfv-ZeEcs3SjBPgwnx1L9i5mv/pub?gid=1459790836&single=true&output=csv",  # Paste your platforms tab CSV URL here
-    "titles": "https://docs.google.com/spreadsheets/d/e/2PACX-1vT_-4nL7L0B90pPRqkI8rAIXcVr75A7wrg6T28cfZefl-ukGyW2pgqkfv-ZeEcs3SjBPgwnx1L9i5mv/pub?gid=127623823&single=true&output=csv",     # Paste your titles tab CSV URL here
-    "genres": "https://docs.google.com/spreadsheets/d/e/2PACX-1vT_-4nL7L0B90pPRqkI8rAIXcVr75A7wrg6T28cfZefl-ukGyW2pgqkfv-ZeEcs3SjBPgwnx1L9i5mv/pub?gid=1423857329&single=true&output=csv",     # Paste your genres tab CSV URL here
-    "regions": "https://docs.google.com/spreadsheets/d/e/2PACX-1vT_-4nL7L0B90pPRqkI8rAIXcVr75A7wrg6T28cfZefl-ukGyW2pgqkfv-ZeEcs3SjBPgwnx1L9i5mv/pub?gid=57981399&single=true&output=csv",    # Paste your regions tab CSV URL here
-}
-
-# Set to True once you've added your Google Sheet URLs
-USE_GOOGLE_SHEETS = True
+import functools
+from datetime import datetime
+
+import charts
+from breaker import CLOSED, HALF_OPEN, CircuitBreaker
+from charts import FigureCache
+from config import (ANOMALY_THRESHOLD, DEFAULT_TOP_N, EXPORT_DIR, HISTORY_PATH, LOCAL_SOURCES, METRICS_LOG,
+                    MOMENTUM_BASELINE, MOMENTUM_WINDOW, SHEET_BREAKER_FAILURES, SHEET_BREAKER_MAX,
+                    SHEET_BREAKER_RESET, SHEET_TIMEOUT, SHEET_URLS, SNAPSHOT_DIR, TABLE_PAGE_ROWS,
+                    TAB_REFRESH_INTERVALS, USE_GOOGLE_SHEETS)
+from cube import TITLE_DIMENSIONS, market_cubes, title_cube
+from data_loader import load_default_data, load_sheets
+from exports import BUNDLE, FORMATS as EXPORT_FORMATS, ExportCache
+from filters import FilterIndex, view_hashes
+from history import HistoryStore
+from momentum import genre_insight, genre_momentum, momentum_labels, platform_momentum, status_column
+from perf import PerfStats, RunTimer
+from refresher import BackgroundRefresher
+from schema import schema_issues
+from snapshot_cache import SnapshotCache, tab_version
+from sources import load_tabs
+from transforms import build_rankings_table, content_breakdown, genre_counts, kpi_tiles, table_page, title_breakdown
 
 # ============================================
 # PAGE CONFIG
@@ -102,126 +87,200 @@ st.markdown("""
 # DATA LOADING FUNCTIONS
 # ============================================
 
-@st.cache_data(ttl=300)
-def load_from_google_sheets():
-    """Load data from published Google Sheets"""
-    data = {}
-    try:
-        if SHEET_URLS["platforms"]:
-            data["platforms"] = pd.read_csv(SHEET_URLS["platforms"])
-        if SHEET_URLS["titles"]:
-            data["titles"] = pd.read_csv(SHEET_URLS["titles"])
-        if SHEET_URLS["genres"]:
-            data["genres"] = pd.read_csv(SHEET_URLS["genres"])
-        if SHEET_URLS["regions"]:
-            data["regions"] = pd.read_csv(SHEET_URLS["regions"])
-    except Exception as e:
-        st.error(f"Error loading Google Sheets: {e}")
-        return None
-    return data
-
-def load_default_data():
-    """Load hardcoded default data"""
-    
-    platforms_data = [
-        {"platform": "ReelShort", "company": "Crazy Maple Studio", "origin": "China", "score": 4.2, "installs": 50000000, "revenue_2024": 400, "revenue_q1_2025": 180, "rank_current": 1, "rank_last_week": 1, "us_share": 55, "content_count": 500, "monetization": "Coins + Subscription", "threat_level": "Market Leader"},
-        {"platform": "DramaBox", "company": "StoryMatrix (Tencent)", "origin": "Singapore", "score": 4.6, "installs": 100000000, "revenue_2024": 323, "revenue_q1_2025": 145, "rank_current": 2, "rank_last_week": 2, "us_share": 30, "content_count": 400, "monetization": "Coins + Ads", "threat_level": "Strong Challenger"},
-        {"platform": "ShortMax", "company": "Jiuzhou Cultural", "origin": "China", "score": 4.4, "installs": 20000000, "revenue_2024": 85, "revenue_q1_2025": 52, "rank_current": 3, "rank_last_week": 4, "us_share": 8, "content_count": 300, "monetization": "Coins + Subscription", "threat_level": "Rising Fast"},
-        {"platform": "GoodShort", "company": "Nice New", "origin": "China", "score": 4.3, "installs": 10000000, "revenue_2024": 50, "revenue_q1_2025": 28, "rank_current": 4, "rank_last_week": 3, "us_share": 5, "content_count": 250, "monetization": "Coins", "threat_level": "Established"},
-        {"platform": "FlexTV", "company": "Chengdu Yuewen", "origin": "China", "score": 4.1, "installs": 15000000, "revenue_2024": 65, "revenue_q1_2025": 38, "rank_current": 5, "rank_last_week": 5, "us_share": 4, "content_count": 280, "monetization": "Coins + Ads", "threat_level": "Stable"},
-        {"platform": "My Drama", "company": "Holywater / Fox", "origin": "Ukraine", "score": 4.3, "installs": 10000000, "revenue_2024": 40, "revenue_q1_2025": 25, "rank_current": 6, "rank_last_week": 7, "us_share": 3, "content_count": 180, "monetization": "Subscription", "threat_level": "Fox-Backed Growth"},
-        {"platform": "PineDrama", "company": "ByteDance", "origin": "China/TikTok", "score": 4.7, "installs": 2000000, "revenue_2024": 0, "revenue_q1_2025": 5, "rank_current": 7, "rank_last_week": 10, "us_share": 1, "content_count": 50, "monetization": "Free (Ad-supported)", "threat_level": "⚠️ WATCH CLOSELY"},
-        {"platform": "GammaTime", "company": "GammaTime Inc", "origin": "USA", "score": 4.5, "installs": 1000000, "revenue_2024": 0, "revenue_q1_2025": 3, "rank_current": 8, "rank_last_week": 8, "us_share": 1, "content_count": 25, "monetization": "Premium Subscription", "threat_level": "Celebrity-Backed"},
-        {"platform": "Vigloo", "company": "SpoonLabs", "origin": "South Korea", "score": 4.4, "installs": 1000000, "revenue_2024": 15, "revenue_q1_2025": 8, "rank_current": 9, "rank_last_week": 9, "us_share": 1, "content_count": 120, "monetization": "Coins", "threat_level": "K-Content Edge"},
-        {"platform": "MoboReels", "company": "Times Internet", "origin": "India", "score": 4.0, "installs": 5000000, "revenue_2024": 20, "revenue_q1_2025": 12, "rank_current": 10, "rank_last_week": 11, "us_share": 0.5, "content_count": 150, "monetization": "Ads + Coins", "threat_level": "Regional Player"},
-    ]
-    
-    titles_data = [
-        {"title": "The Double Life of My Billionaire Husband", "platform": "ReelShort", "genre": "Romance", "sub_genre": "Billionaire", "episodes": 92, "revenue_est": 22, "views_est": "180M", "weeks_trending": 12, "status": "🔥 #1 Overall"},
-        {"title": "Satisfying Justice", "platform": "ReelShort", "genre": "Revenge", "sub_genre": "Family Drama", "episodes": 85, "revenue_est": 18, "views_est": "150M", "weeks_trending": 8, "status": "📈 Rising"},
-        {"title": "Love at First Bite", "platform": "DramaBox", "genre": "Paranormal", "sub_genre": "Vampire Romance", "episodes": 80, "revenue_est": 15, "views_est": "120M", "weeks_trending": 10, "status": "⭐ Steady"},
-        {"title": "Trapped with the CEO", "platform": "ShortMax", "genre": "Romance", "sub_genre": "CEO", "episodes": 78, "revenue_est": 12, "views_est": "95M", "weeks_trending": 6, "status": "📈 Rising"},
-        {"title": "My Secret Mafia Husband", "platform": "My Drama", "genre": "Thriller", "sub_genre": "Mafia Romance", "episodes": 70, "revenue_est": 8, "views_est": "65M", "weeks_trending": 5, "status": "🆕 New Entry"},
-        {"title": "The Alpha's Rejected Mate", "platform": "FlexTV", "genre": "Paranormal", "sub_genre": "Werewolf", "episodes": 88, "revenue_est": 10, "views_est": "80M", "weeks_trending": 7, "status": "⭐ Steady"},
-        {"title": "Revenge of the Discarded Wife", "platform": "DramaBox", "genre": "Revenge", "sub_genre": "Divorce Drama", "episodes": 65, "revenue_est": 9, "views_est": "70M", "weeks_trending": 4, "status": "📈 Rising"},
-        {"title": "Pregnant and Abandoned", "platform": "GoodShort", "genre": "Drama", "sub_genre": "Secret Baby", "episodes": 72, "revenue_est": 7, "views_est": "55M", "weeks_trending": 9, "status": "⭐ Steady"},
-    ]
-    
-    genres_data = [
-        {"genre": "Romance", "market_share": 45, "growth_rate": 25, "avg_completion": 78},
-        {"genre": "Revenge", "market_share": 18, "growth_rate": 85, "avg_completion": 82},
-        {"genre": "Paranormal", "market_share": 12, "growth_rate": 45, "avg_completion": 75},
-        {"genre": "Thriller", "market_share": 10, "growth_rate": 60, "avg_completion": 80},
-        {"genre": "Comedy", "market_share": 8, "growth_rate": 30, "avg_completion": 65},
-        {"genre": "Family Drama", "market_share": 7, "growth_rate": 40, "avg_completion": 72},
-    ]
-    
-    regions_data = [
-        {"region": "United States", "market_share": 49, "revenue_q1": 343, "growth": 380, "top_platform": "ReelShort"},
-        {"region": "Southeast Asia", "market_share": 18, "revenue_q1": 126, "growth": 450, "top_platform": "DramaBox"},
-        {"region": "Latin America", "market_share": 12, "revenue_q1": 84, "growth": 520, "top_platform": "ReelShort"},
-        {"region": "Europe", "market_share": 10, "revenue_q1": 70, "growth": 280, "top_platform": "DramaBox"},
-        {"region": "Middle East", "market_share": 6, "revenue_q1": 42, "growth": 350, "top_platform": "ShortMax"},
-        {"region": "Other", "market_share": 5, "revenue_q1": 35, "growth": 200, "top_platform": "Various"},
-    ]
-    
-    return {
-        "platforms": pd.DataFrame(platforms_data),
-        "titles": pd.DataFrame(titles_data),
-        "genres": pd.DataFrame(genres_data),
-        "regions": pd.DataFrame(regions_data)
-    }
+def load_from_google_sheets(tabs, previous, breaker=None):
+    """Load tabs from published Google Sheets, skipping unchanged ones"""
+    return load_sheets(SHEET_URLS if USE_GOOGLE_SHEETS else {}, timeout=SHEET_TIMEOUT, tabs=tabs, previous=previous,
+                       breaker=breaker)
+
+def load_from_sources(tabs, previous, breaker=None):
+    """Load tabs from their local file or database if one is configured, the rest from Google Sheets"""
+    return load_tabs(LOCAL_SOURCES, lambda rest, prior: load_from_google_sheets(rest, prior, breaker),
+                     tabs=tabs, previous=previous)
+
+@st.cache_resource
+def get_sheets_breaker():
+    """Circuit breaker for the Google Sheets endpoint, shared by the refresher and the sidebar"""
+    return CircuitBreaker(SHEET_BREAKER_FAILURES, SHEET_BREAKER_RESET, SHEET_BREAKER_MAX)
+
+@st.cache_resource
+def get_history():
+    """Weekly history of every loaded version, shared by every session"""
+    return HistoryStore(HISTORY_PATH)
+
+@st.cache_resource
+def get_refresher():
+    """One snapshot cache and refresher thread per process, shared by every session"""
+    cache = SnapshotCache(SNAPSHOT_DIR)
+    history = get_history()
+
+    def record_history(snapshot, changed_tabs, live_tabs):
+        # Only data read live in this refresh is an observation of this week;
+        # saved or built-in fallbacks would repeat an older week's values
+        tabs = [tab for tab in ("platforms", "titles", "genres") if tab in live_tabs]
+        if tabs:
+            history.record(snapshot, tabs)
+
+    fetch = functools.partial(load_from_sources, breaker=get_sheets_breaker())
+    return BackgroundRefresher(cache, fetch, intervals=TAB_REFRESH_INTERVALS,
+                               on_publish=record_history).start()
 
 # ============================================
 # LOAD DATA
 # ============================================
 
-if USE_GOOGLE_SHEETS and any(SHEET_URLS.values()):
-    data = load_from_google_sheets()
-    if data is None:
-        st.warning("Failed to load from Google Sheets. Using default data.")
+# Every run logs its figure payload; serialising each table page again to
+# count its bytes is left to the debug panel
+run_timer = RunTimer(measure_tables=bool(st.query_params.get("debug")))
+run_timer.start("Load Data")
+
+snapshot, refresher = None, None
+if (USE_GOOGLE_SHEETS and any(SHEET_URLS.values())) or LOCAL_SOURCES:
+    refresher = get_refresher()
+    cache = refresher.cache
+    if cache.current is None:
+        # Nothing on disk yet: give the refresher's first pass a chance
+        refresher.wait_until_ready(timeout=SHEET_TIMEOUT + 1)
+    snapshot, tab_status = cache.current, cache.status
+    if snapshot is None:
         data = load_default_data()
+        tab_status = {tab: {"live": False, "source": "default", "error": "still loading"} for tab in data}
+    else:
+        data = snapshot["data"]
+    failed_tabs = [tab for tab, s in tab_status.items() if s["error"]]
+    if failed_tabs:
+        st.warning(f"Failed to load {', '.join(failed_tabs)} from their source. Using saved or default data for those tabs.")
 else:
-    data = load_default_data()
+    data, tab_status = load_default_data(), None
+
+# Rank changes and momentum come from the weekly history when the data is
+# live, measured from the week each tab's data on screen was recorded in:
+# the calendar week has no entry until the sheet next changes
+history_weeks = {}
+if refresher is not None:
+    history_weeks = {tab: get_history().recorded_week(tab) for tab in ("platforms", "genres")
+                     if tab_status[tab]["source"] != "default"}
+
+# Per-tab content hashes: derived data is cached on the tabs it reads, so a
+# change to one tab leaves everything built from the others untouched
+tab_hashes = snapshot["hashes"] if snapshot is not None else {tab: "default" for tab in data}
 
 df_platforms = data["platforms"]
 df_titles = data["titles"]
 df_genres = data["genres"]
 df_regions = data["regions"]
+run_timer.count(sum(len(df) for df in data.values()))
 
 # ============================================
 # HELPER FUNCTIONS
 # ============================================
 
-def format_number(num):
-    if num >= 1_000_000_000:
-        return f"{num/1_000_000_000:.1f}B"
-    elif num >= 1_000_000:
-        return f"{num/1_000_000:.0f}M"
-    elif num >= 1_000:
-        return f"{num/1_000:.0f}K"
-    return str(num)
-
-def get_rank_change_indicator(current, last_week):
-    change = last_week - current
-    if change > 0:
-        return f"🟢 +{change}"
-    elif change < 0:
-        return f"🔴 {change}"
-    return "⚪ —"
-
-PLATFORM_COLORS = {
-    "ReelShort": "#ef4444",
-    "DramaBox": "#8b5cf6",
-    "ShortMax": "#f59e0b",
-    "GoodShort": "#10b981",
-    "FlexTV": "#3b82f6",
-    "My Drama": "#ec4899",
-    "PineDrama": "#000000",
-    "GammaTime": "#6366f1",
-    "Vigloo": "#14b8a6",
-    "MoboReels": "#f97316",
-}
+# Derived frames are shared cache_resource entries rather than cache_data,
+# which hands every session its own unpickled copy on every run. Copy-on-write
+# keeps a session's changes to them from reaching the shared frame.
+
+@st.cache_resource(max_entries=8)
+def get_rankings_table(platforms_version, week, _df_platforms, _moves=None):
+    """
+    Formatted Platform Rankings table, rebuilt when platforms (or the
+    filter on it) or the week changes, and shared by every session. With a
+    ``week``, rank changes come from the history store and the status from
+    ``_moves``.
+    """
+    if not week:
+        return build_rankings_table(_df_platforms)
+    status = status_column(_df_platforms, _moves, MOMENTUM_WINDOW)
+    return build_rankings_table(_df_platforms, get_history().previous_ranks(week), status)
+
+def history_window(week):
+    """Weeks of history the momentum scores look at, ending at ``week``"""
+    return dict(weeks=MOMENTUM_WINDOW + MOMENTUM_BASELINE + 1, until=week)
+
+@st.cache_resource(max_entries=8)
+def get_platform_momentum(week, platforms_version):
+    """Latest momentum per platform, recomputed when platforms or the week changes"""
+    return platform_momentum(get_history().platform_weeks(**history_window(week)),
+                             MOMENTUM_WINDOW, MOMENTUM_BASELINE, ANOMALY_THRESHOLD)
+
+@st.cache_resource(max_entries=8)
+def get_genre_momentum(week, genres_version):
+    """Latest momentum per genre, recomputed when genres or the week changes"""
+    return genre_momentum(get_history().genre_weeks(**history_window(week)),
+                          MOMENTUM_WINDOW, MOMENTUM_BASELINE, ANOMALY_THRESHOLD)
+
+@st.cache_resource
+def get_export_cache():
+    """Export files are shared by every session and built on first click"""
+    return ExportCache(EXPORT_DIR)
+
+def export_versions():
+    """Export folder of every tab and of the bundle, which pruning must keep"""
+    return {tab_version(tab_hashes, tab) for tab in data} | {tab_version(tab_hashes, *data)}
+
+def export_buttons(tab, df, label):
+    """One download button per export format; nothing is serialised until clicked"""
+    export_cache = get_export_cache()
+    version = tab_version(tab_hashes, tab)
+    stamp = datetime.now().strftime('%Y%m%d')
+    for col, (fmt, spec) in zip(st.columns(len(EXPORT_FORMATS)), EXPORT_FORMATS.items()):
+        with col:
+            st.download_button(f"📥 Download {label} ({spec['label']})",
+                               lambda fmt=fmt: export_cache.tab(version, tab, df, fmt, export_versions()),
+                               f"microdrama_{EXPORT_STEMS[tab]}_{stamp}{spec['suffix']}", spec["mime"],
+                               on_click="ignore", key=f"export_{tab}_{fmt}")
+
+@st.fragment
+def paged_dataframe(df, key, **options):
+    """
+    ``st.dataframe`` that sends at most TABLE_PAGE_ROWS rows: longer frames
+    get a page picker, only the page shown is serialised, and turning the
+    page re-runs just this table
+    """
+    pages = max(1, -(-len(df) // TABLE_PAGE_ROWS))
+    page = 1
+    if pages > 1:
+        page_key = f"{key}_page"
+        # A filter may have shortened the table since the page was picked
+        if st.session_state.get(page_key, 1) > pages:
+            st.session_state[page_key] = pages
+        page = st.number_input("Page", min_value=1, max_value=pages, step=1, key=page_key)
+        start = (page - 1) * TABLE_PAGE_ROWS
+        st.caption(f"Rows {start + 1:,}–{min(start + TABLE_PAGE_ROWS, len(df)):,} of {len(df):,} · page {page} of {pages:,}")
+    st.dataframe(run_timer.table(table_page(df, page, TABLE_PAGE_ROWS)), **options)
+
+# Download file names per tab (kept from the original CSV buttons)
+EXPORT_STEMS = {"platforms": "platforms", "titles": "titles", "genres": "genres", "regions": "regional"}
+
+@st.cache_resource
+def get_figure_cache():
+    """Built Plotly figures, shared by every session"""
+    return FigureCache()
+
+def cached_figure(name, tabs, build, *frames, **params):
+    """Figure from the cache, rebuilt only when one of ``tabs`` or ``params`` changes"""
+    fig = get_figure_cache().get(name, tab_version(filtered_hashes, *tabs), build, *frames, **params)
+    return run_timer.figure(fig)
+
+@st.cache_resource(max_entries=4)
+def get_filter_index(data_version, _data):
+    """Filter codes and title search index, built once per data version and shared"""
+    return FilterIndex(_data)
+
+@st.cache_resource(max_entries=4)
+def get_market_cubes(data_version, _data):
+    """Title and platform rollups, built once per data version and shared"""
+    return market_cubes(_data)
+
+@st.cache_resource(max_entries=8)
+def get_search_cube(titles_version, platforms_version, _df_titles, _df_platforms):
+    """Titles cube of a search result, which slicing the full cube can't give (origin comes from platforms)"""
+    return title_cube(_df_titles, _df_platforms)
+
+@st.cache_resource
+def get_perf_stats():
+    """Section timings of every session's runs, for the debug panel and metrics log"""
+    return PerfStats(METRICS_LOG or None)
+
+run_timer.stop()
 
 # ============================================
 # SIDEBAR
@@ -232,15 +291,63 @@ with st.sidebar:
     st.markdown("*Market Intelligence Dashboard*")
     st.markdown("---")
     
-    if USE_GOOGLE_SHEETS and any(SHEET_URLS.values()):
+    if tab_status is None:
+        st.info("📋 Using default dataset")
+    elif all(s["live"] for s in tab_status.values()):
         st.success("📊 Live data from Google Sheets")
+    elif not any(s["error"] for s in tab_status.values()):
+        st.info("📦 Showing saved snapshot, refreshing in background")
     else:
-        st.info("📋 Using default dataset")
+        live = [tab for tab, s in tab_status.items() if s["live"]]
+        st.warning(f"📊 Live: {', '.join(live) or 'none'}")
+        for tab, s in tab_status.items():
+            if not s["live"]:
+                reason = s["error"] or "revalidating"
+                st.caption(f"⚠️ **{tab}** stale ({s['source']} data): {reason}")
+    
+    st.markdown("---")
+    chart_top_n = st.slider("Top N in charts", min_value=5, max_value=50, value=DEFAULT_TOP_N,
+                            help="Everything beyond the top N is rolled up into one \"Other\" bar or slice")
+    
+    st.markdown("### 🔎 Filters")
+    filter_index = get_filter_index(tab_version(tab_hashes, *data), data)
+    filter_selections = {
+        name: st.multiselect(label, filter_index.options(name), key=f"filter_{name}")
+        for name, label in [("platform", "Platform"), ("origin", "Origin"), ("genre", "Genre"),
+                            ("sub_genre", "Sub-genre"), ("region", "Region")]
+    }
+    title_search = st.text_input("Search titles", key="filter_search", placeholder="e.g. billionaire ceo",
+                                 help="Matches words in the title or sub-genre that start with what you type")
     
     st.markdown("---")
     st.markdown("### 📅 Data Status")
     st.markdown(f"**Last Updated:** {datetime.now().strftime('%B %d, %Y')}")
     st.markdown(f"**Week:** {datetime.now().strftime('%U')} of {datetime.now().year}")
+    for tab, df in data.items():
+        issues = schema_issues(df)
+        if issues:
+            cells = ", ".join(f"row {i['row'] + 2} {i['column']}" if i['row'] is not None else f"{i['column']} (missing)"
+                              for i in issues[:3])
+            st.caption(f"⚠️ **{tab}**: {len(issues)} value(s) couldn't be read — {cells}{'…' if len(issues) > 3 else ''}")
+    if snapshot is not None:
+        saved = datetime.fromtimestamp(snapshot['saved_at']).strftime('%b %d, %H:%M')
+        st.caption(f"Data version `{snapshot['version']}` · saved {saved}")
+    fig_stats = get_figure_cache().stats()
+    st.caption(f"Chart cache: {fig_stats['hits']} hits / {fig_stats['misses']} misses "
+               f"({fig_stats['hit_rate']:.0%})")
+    if refresher is not None:
+        if refresher.next_run_at:
+            wait_s = max(0, refresher.next_run_at - datetime.now().timestamp())
+            st.caption(f"Next refresh in {wait_s / 60:.0f} min"
+                       + (f" · {refresher.failures} failed attempt(s)" if refresher.failures else ""))
+        if USE_GOOGLE_SHEETS and any(SHEET_URLS.values()):
+            breaker = get_sheets_breaker()
+            icon = {CLOSED: "🟢", HALF_OPEN: "🟡"}.get(breaker.state, "🔴")
+            st.caption(f"{icon} Google Sheets: {breaker.describe()}"
+                       + (" · serving the last good data" if breaker.state != CLOSED else ""))
+        if st.button("🔄 Refresh now", use_container_width=True):
+            refresher.trigger(wait=SHEET_TIMEOUT + 1)
+            st.rerun()
     
     st.markdown("---")
     st.markdown("### 📊 Market Snapshot")
@@ -252,6 +359,27 @@ with st.sidebar:
     st.markdown("**Built by Vinitha Nair**")
     st.markdown("📧 vinithanair.v1@gmail.com")
 
+# Every chart, KPI and table below reads the filtered frames; the raw data
+# and exports further down stay on the full data
+run_timer.start("Filters")
+filtered, filter_keys = filter_index.apply(data, filter_selections, title_search)
+df_platforms = filtered["platforms"]
+df_titles = filtered["titles"]
+df_genres = filtered["genres"]
+df_regions = filtered["regions"]
+filtered_hashes = view_hashes(tab_hashes, filter_keys, filter_selections)
+# KPIs and breakdowns come from the rollup cubes, sliced by the same
+# selections; only a title search needs a cube over the matching rows
+market_cube = get_market_cubes(tab_version(tab_hashes, *data), data)
+platforms_cube = market_cube["platforms"].slice(filter_selections)
+if title_search.strip():
+    titles_cube = get_search_cube(tab_version(filtered_hashes, 'titles'), tab_version(tab_hashes, 'platforms'),
+                                  df_titles, data["platforms"])
+else:
+    titles_cube = market_cube["titles"].slice(filter_selections)
+run_timer.count(sum(len(df) for df in filtered.values()))
+run_timer.stop()
+
 # ============================================
 # MAIN DASHBOARD
 # ============================================
@@ -265,321 +393,368 @@ st.markdown("---")
 # TOP METRICS
 # ============================================
 
-col1, col2, col3, col4, col5 = st.columns(5)
-
-with col1:
-    st.metric("Platforms Tracked", len(df_platforms), "2 new this quarter")
-
-with col2:
-    total_downloads = df_platforms['installs'].sum()
-    st.metric("Total Downloads", format_number(total_downloads), "+18% MoM")
-
-with col3:
-    total_revenue = df_platforms['revenue_q1_2025'].sum()
-    st.metric("Q1 2025 Revenue", f"${total_revenue}M", "+380% YoY")
+def top_metrics():
+    run_timer.start("Top Metrics", rows=len(df_platforms))
 
-with col4:
-    total_content = df_platforms['content_count'].sum()
-    st.metric("Titles in Market", f"{total_content:,}+", "+25% QoQ")
+    for col, (label, value, delta) in zip(st.columns(5), kpi_tiles(platforms_cube)):
+        with col:
+            st.metric(label, value, delta)
 
-with col5:
-    avg_rating = df_platforms['score'].mean()
-    st.metric("Avg Rating", f"{avg_rating:.2f} ⭐", "+0.1")
-
-st.markdown("---")
+    st.markdown("---")
 
 # ============================================
 # PLATFORM RANKINGS
 # ============================================
 
-st.subheader("📱 Platform Rankings")
-
-df_display = df_platforms.copy()
-df_display['change'] = df_display.apply(lambda x: get_rank_change_indicator(x['rank_current'], x['rank_last_week']), axis=1)
-df_display['downloads_fmt'] = df_display['installs'].apply(format_number)
-df_display['revenue_fmt'] = df_display['revenue_q1_2025'].apply(lambda x: f"${x}M")
-df_display['rating_fmt'] = df_display['score'].apply(lambda x: f"{x} ⭐")
-df_display['us_share_fmt'] = df_display['us_share'].apply(lambda x: f"{x}%")
+def platform_rankings():
+    run_timer.start("Platform Rankings", rows=len(df_platforms))
 
-display_cols = df_display[[
-    'rank_current', 'change', 'platform', 'company', 'origin', 
-    'downloads_fmt', 'revenue_fmt', 'rating_fmt', 'us_share_fmt', 
-    'content_count', 'threat_level'
-]].sort_values('rank_current')
+    st.subheader("📱 Platform Rankings")
 
-display_cols.columns = ['Rank', 'Δ', 'Platform', 'Company', 'Origin', 'Downloads', 'Q1 Revenue', 'Rating', 'US Share', 'Titles', 'Status']
+    platform_week = history_weeks.get('platforms')
+    platform_moves = get_platform_momentum(platform_week, tab_version(tab_hashes, 'platforms')) if platform_week else None
+    display_cols = get_rankings_table(tab_version(filtered_hashes, 'platforms'), platform_week, df_platforms, platform_moves)
 
-st.dataframe(display_cols, use_container_width=True, hide_index=True)
+    paged_dataframe(display_cols, "rankings", use_container_width=True, hide_index=True)
 
-# Charts
-col_chart1, col_chart2 = st.columns(2)
+    # Charts
+    col_chart1, col_chart2 = st.columns(2)
 
-with col_chart1:
-    df_revenue = df_platforms[df_platforms['revenue_q1_2025'] > 0].sort_values('revenue_q1_2025', ascending=True)
-    fig_revenue = px.bar(df_revenue, x='revenue_q1_2025', y='platform', orientation='h', color='origin',
-                         title='Q1 2025 Revenue by Platform ($M)', color_discrete_sequence=px.colors.qualitative.Set2)
-    fig_revenue.update_layout(height=400, xaxis_title="Revenue ($M)", yaxis_title="")
-    st.plotly_chart(fig_revenue, use_container_width=True)
+    with col_chart1:
+        fig_revenue = cached_figure('revenue_by_platform', ['platforms'], charts.revenue_by_platform, df_platforms,
+                                      top_n=chart_top_n)
+        st.plotly_chart(fig_revenue, use_container_width=True)
 
-with col_chart2:
-    df_share = df_platforms[df_platforms['us_share'] > 0]
-    fig_share = px.pie(df_share, values='us_share', names='platform', title='US Market Share by Platform',
-                       color_discrete_sequence=px.colors.qualitative.Pastel)
-    fig_share.update_layout(height=400)
-    st.plotly_chart(fig_share, use_container_width=True)
+    with col_chart2:
+        fig_share = cached_figure('us_share_by_platform', ['platforms'], charts.us_share_by_platform, df_platforms,
+                                    top_n=chart_top_n)
+        st.plotly_chart(fig_share, use_container_width=True)
 
-st.markdown("---")
+    st.markdown("---")
 
 # ============================================
 # TRENDING CONTENT
 # ============================================
 
-st.subheader("🔥 Trending Content")
+def trending_content():
+    run_timer.start("Trending Content", rows=len(df_titles))
 
-col_trend1, col_trend2 = st.columns([2, 1])
+    st.subheader("🔥 Trending Content")
 
-with col_trend1:
-    df_titles_sorted = df_titles.sort_values('revenue_est', ascending=True)
-    fig_titles = px.bar(df_titles_sorted, x='revenue_est', y='title', color='platform', orientation='h',
-                        title='Top Performing Titles - Estimated Revenue ($M)', color_discrete_map=PLATFORM_COLORS,
-                        hover_data=['genre', 'episodes', 'views_est'])
-    fig_titles.update_layout(height=450, xaxis_title="Estimated Revenue ($M)", yaxis_title="")
-    st.plotly_chart(fig_titles, use_container_width=True)
+    col_trend1, col_trend2 = st.columns([2, 1])
 
-with col_trend2:
-    st.markdown("**📋 Content Breakdown**")
-    genre_counts = df_titles.groupby('genre').size().reset_index(name='count')
-    fig_genre = px.pie(genre_counts, values='count', names='genre', title='Genre Mix',
-                       color_discrete_sequence=px.colors.qualitative.Set3)
-    fig_genre.update_layout(height=250, margin=dict(t=50, b=0, l=0, r=0))
-    st.plotly_chart(fig_genre, use_container_width=True)
-    
-    st.markdown(f"**Avg Episodes:** {df_titles['episodes'].mean():.0f}")
-    st.markdown(f"**Avg Revenue:** ${df_titles['revenue_est'].mean():.1f}M")
-    st.markdown(f"**Top Genre:** {genre_counts.loc[genre_counts['count'].idxmax(), 'genre']}")
+    with col_trend1:
+        fig_titles = cached_figure('top_titles', ['titles'], charts.top_titles, df_titles,
+                                     top_n=chart_top_n)
+        st.plotly_chart(fig_titles, use_container_width=True)
 
-st.markdown("---")
+    with col_trend2:
+        st.markdown("**📋 Content Breakdown**")
+        title_genres = genre_counts(titles_cube)
+        fig_genre = cached_figure('genre_mix', ['titles'], charts.genre_mix, title_genres)
+        st.plotly_chart(fig_genre, use_container_width=True)
+
+        for label, value in content_breakdown(titles_cube, title_genres):
+            st.markdown(f"**{label}:** {value}")
+
+    drill_down(titles_cube)
+
+    st.markdown("---")
+
+@st.fragment
+def drill_down(titles_cube):
+    """Grouping changes re-run only this expander, not the page"""
+    with st.expander("🔍 Drill down: titles by platform, genre and more"):
+        drill_dims = st.multiselect("Group by", list(TITLE_DIMENSIONS), default=["genre", "platform"],
+                                    format_func=lambda name: name.replace("_", "-").capitalize(), key="drill_down")
+        if drill_dims:
+            paged_dataframe(title_breakdown(titles_cube, drill_dims), "drill_down_table",
+                            use_container_width=True, hide_index=True,
+                            column_config={
+                                "Revenue ($M)": st.column_config.NumberColumn(format="$%d"),
+                                "Views": st.column_config.NumberColumn(format="compact"),
+                                "Avg Episodes": st.column_config.NumberColumn(format="%.0f"),
+                            })
 
 # ============================================
 # GENRE ANALYSIS
 # ============================================
 
-st.subheader("📊 Genre Analysis")
+def genre_analysis():
+    run_timer.start("Genre Analysis", rows=len(df_genres))
 
-col_genre1, col_genre2, col_genre3 = st.columns(3)
+    st.subheader("📊 Genre Analysis")
 
-with col_genre1:
-    fig_g1 = px.bar(df_genres.sort_values('market_share', ascending=True), x='market_share', y='genre',
-                    orientation='h', title='Market Share (%)', color='market_share', color_continuous_scale='Purples')
-    fig_g1.update_layout(height=300, showlegend=False)
-    fig_g1.update_coloraxes(showscale=False)
-    st.plotly_chart(fig_g1, use_container_width=True)
+    col_genre1, col_genre2, col_genre3 = st.columns(3)
 
-with col_genre2:
-    fig_g2 = px.bar(df_genres.sort_values('growth_rate', ascending=True), x='growth_rate', y='genre',
-                    orientation='h', title='YoY Growth Rate (%)', color='growth_rate', color_continuous_scale='Oranges')
-    fig_g2.update_layout(height=300, showlegend=False)
-    fig_g2.update_coloraxes(showscale=False)
-    st.plotly_chart(fig_g2, use_container_width=True)
+    with col_genre1:
+        fig_g1 = cached_figure('genre_bar', ['genres'], charts.genre_bar, df_genres,
+                               measure='market_share', title='Market Share (%)', color_scale='Purples', top_n=chart_top_n)
+        st.plotly_chart(fig_g1, use_container_width=True)
 
-with col_genre3:
-    fig_g3 = px.bar(df_genres.sort_values('avg_completion', ascending=True), x='avg_completion', y='genre',
-                    orientation='h', title='Completion Rate (%)', color='avg_completion', color_continuous_scale='Greens')
-    fig_g3.update_layout(height=300, showlegend=False)
-    fig_g3.update_coloraxes(showscale=False)
-    st.plotly_chart(fig_g3, use_container_width=True)
+    with col_genre2:
+        fig_g2 = cached_figure('genre_bar', ['genres'], charts.genre_bar, df_genres,
+                               measure='growth_rate', title='YoY Growth Rate (%)', color_scale='Oranges', top_n=chart_top_n)
+        st.plotly_chart(fig_g2, use_container_width=True)
 
-st.info("💡 **Key Insight:** Revenge content is the fastest-growing genre (+85% YoY) with the highest completion rates (82%), suggesting strong audience demand for justice/empowerment narratives.")
+    with col_genre3:
+        fig_g3 = cached_figure('genre_bar', ['genres'], charts.genre_bar, df_genres,
+                               measure='avg_completion', title='Completion Rate (%)', color_scale='Greens', top_n=chart_top_n)
+        st.plotly_chart(fig_g3, use_container_width=True)
 
-st.markdown("---")
+    genre_week = history_weeks.get('genres')
+    genre_moves = get_genre_momentum(genre_week, tab_version(tab_hashes, 'genres')) if genre_week else None
+    st.info(f"💡 **Key Insight:** {genre_insight(df_genres, genre_moves, MOMENTUM_WINDOW)}")
+
+    st.markdown("---")
 
 # ============================================
 # REGIONAL BREAKDOWN
 # ============================================
 
-st.subheader("🌍 Regional Breakdown")
+def regional_breakdown():
+    run_timer.start("Regional Breakdown", rows=len(df_regions))
 
-col_reg1, col_reg2 = st.columns(2)
+    st.subheader("🌍 Regional Breakdown")
 
-with col_reg1:
-    fig_reg1 = px.pie(df_regions, values='market_share', names='region', title='Global Market Share by Region',
-                      color_discrete_sequence=px.colors.qualitative.Pastel, hole=0.4)
-    fig_reg1.update_layout(height=350)
-    st.plotly_chart(fig_reg1, use_container_width=True)
+    col_reg1, col_reg2 = st.columns(2)
 
-with col_reg2:
-    fig_reg2 = px.bar(df_regions.sort_values('growth', ascending=True), x='growth', y='region', orientation='h',
-                      title='YoY Growth Rate by Region (%)', color='growth', color_continuous_scale='Blues', text='growth')
-    fig_reg2.update_traces(texttemplate='%{text}%', textposition='outside')
-    fig_reg2.update_layout(height=350, showlegend=False)
-    fig_reg2.update_coloraxes(showscale=False)
-    st.plotly_chart(fig_reg2, use_container_width=True)
+    with col_reg1:
+        fig_reg1 = cached_figure('region_share', ['regions'], charts.region_share, df_regions,
+                                  top_n=chart_top_n)
+        st.plotly_chart(fig_reg1, use_container_width=True)
 
-st.dataframe(df_regions, use_container_width=True, hide_index=True,
-             column_config={
-                 "region": "Region",
-                 "market_share": st.column_config.ProgressColumn("Market Share %", min_value=0, max_value=50),
-                 "revenue_q1": st.column_config.NumberColumn("Q1 Revenue ($M)", format="$%d"),
-                 "growth": st.column_config.NumberColumn("YoY Growth %", format="%d%%"),
-                 "top_platform": "Leading Platform"
-             })
+    with col_reg2:
+        fig_reg2 = cached_figure('region_growth', ['regions'], charts.region_growth, df_regions,
+                                  top_n=chart_top_n)
+        st.plotly_chart(fig_reg2, use_container_width=True)
 
-st.markdown("---")
+    paged_dataframe(df_regions, "regions", use_container_width=True, hide_index=True,
+                    column_config={
+                        "region": "Region",
+                        "market_share": st.column_config.ProgressColumn("Market Share %", min_value=0, max_value=50),
+                        "revenue_q1": st.column_config.NumberColumn("Q1 Revenue ($M)", format="$%d"),
+                        "growth": st.column_config.NumberColumn("YoY Growth %", format="%d%%"),
+                        "top_platform": "Leading Platform"
+                    })
+
+    st.markdown("---")
 
 # ============================================
 # COMPETITIVE INTELLIGENCE
 # ============================================
 
-st.subheader("🎯 Competitive Intelligence")
+def competitive_intelligence():
+    run_timer.stop()
+
+    st.subheader("🎯 Competitive Intelligence")
+
+    tab1, tab2, tab3 = st.tabs(["⚠️ New Entrants", "🤝 Partnership Opps", "📋 Strategic Recs"])
+
+    with tab1:
+        st.markdown(f"#### 📈 Momentum Movers (last {MOMENTUM_WINDOW} weeks)")
+        movers = None
+        if history_weeks.get('platforms'):
+            platform_moves = get_platform_momentum(history_weeks['platforms'], tab_version(tab_hashes, 'platforms'))
+            moves = platform_moves[platform_moves['platform'].isin(df_platforms['platform'])].reset_index(drop=True)
+            # Platforms that showed up after the history began, and have too few
+            # weeks for a trend yet
+            new = (moves['weeks'] <= MOMENTUM_WINDOW) & (moves['weeks'] < moves['weeks'].max())
+            signal = momentum_labels(moves).reset_index(drop=True).mask(new, "🆕 New")
+            movers = moves.assign(status=signal).loc[signal.notna()]
+        if movers is None or movers.empty:
+            st.caption(f"No unusual movers yet — momentum needs more than {MOMENTUM_WINDOW} weeks of recorded history.")
+        else:
+            paged_dataframe(movers.sort_values('rank_velocity', ascending=False, na_position='last'), "movers",
+                            use_container_width=True, hide_index=True,
+                            column_order=['platform', 'status', 'rank_velocity', 'revenue_growth', 'share_change',
+                                          'weeks'],
+                            column_config={
+                                "platform": "Platform",
+                                "status": "Signal",
+                                "rank_velocity": st.column_config.NumberColumn("Places / week", format="%+.1f"),
+                                "revenue_growth": st.column_config.NumberColumn("Revenue growth", format="percent"),
+                                "share_change": st.column_config.NumberColumn("US share Δ (pts)", format="%+.1f"),
+                                "weeks": st.column_config.NumberColumn("Weeks tracked"),
+                            })
+
+        col_ent1, col_ent2, col_ent3 = st.columns(3)
+
+        with col_ent1:
+            st.markdown("""
+            #### 🖤 PineDrama (ByteDance)
+            **Launched:** January 2026  
+            **Threat Level:** 🔴 **CRITICAL**
+
+            **Strategy:**
+            - Free content (no coins)
+            - Ad-free viewing
+            - TikTok cross-promotion
+            - Aggressive content acquisition
+
+            **Watch For:**
+            - Exclusive content deals
+            - Creator partnerships
+            - Marketing blitz
+            """)
+
+        with col_ent2:
+            st.markdown("""
+            #### ✨ GammaTime
+            **Launched:** October 2025  
+            **Threat Level:** 🟠 **HIGH**
+
+            **Strategy:**
+            - "Hollywood quality" positioning
+            - Celebrity investors
+            - Premium subscription model
+
+            **Differentiation:**
+            - US-produced content
+            - A-list talent attached
+            - Premium pricing ($9.99/mo)
+            """)
+
+        with col_ent3:
+            st.markdown("""
+            #### 🦊 Fox + Holywater
+            **Announced:** November 2025  
+            **Threat Level:** 🟠 **MEDIUM-HIGH**
+
+            **Deal Terms:**
+            - Equity stake in Holywater
+            - 200 shows commitment
+            - US market focus
+
+            **Competitive Edge:**
+            - Hollywood IP access
+            - Ukraine production efficiency
+            """)
+
+    with tab2:
+        col_part1, col_part2 = st.columns(2)
+
+        with col_part1:
+            st.markdown("""
+            #### 🎬 Content Supply Partners
+
+            | Company | Strength | Status |
+            |---------|----------|--------|
+            | Crazy Maple Studio | #1 producer | ReelShort exclusive |
+            | StoryMatrix | High volume | DramaBox exclusive |
+            | Vertical Film Vancouver | Western production | Open to deals |
+            | COL Group | Novel adaptations | Seeking partners |
+            | Wattpad / WEBTOON | IP pipeline | Open to licensing |
+            """)
+
+        with col_part2:
+            st.markdown("""
+            #### 📺 Distribution Partners
+
+            | Platform | Opportunity | Fit |
+            |----------|-------------|-----|
+            | Tubi | FAST channel | High |
+            | Pluto TV | Dedicated channel | High |
+            | YouTube Shorts | Discovery funnel | Medium |
+            | Roku Channel | Growing FAST | Medium |
+            """)
+
+    with tab3:
+        col_rec1, col_rec2 = st.columns(2)
+
+        with col_rec1:
+            st.markdown("""
+            #### 🎯 Immediate Actions (30 Days)
+
+            1. **Weekly PineDrama Monitoring**
+               - Track downloads/rankings daily
+               - Report significant movements
+
+            2. **Evaluate Non-Exclusive Suppliers**
+               - Vertical Film Vancouver
+               - Independent Korean studios
+
+            3. **Genre Diversification**
+               - Revenge content (+85% growth)
+               - Thriller/Horror underserved
+            """)
+
+        with col_rec2:
+            st.markdown("""
+            #### 📈 Strategic Initiatives (90 Days)
+
+            1. **Content Strategy**
+               - Increase revenge/justice mix
+               - Pilot true crime format
+
+            2. **Distribution Expansion**
+               - FAST channel pilot
+               - YouTube Shorts strategy
+
+            3. **Partnership Development**
+               - Explore studio JV models
+            """)
 
-tab1, tab2, tab3 = st.tabs(["⚠️ New Entrants", "🤝 Partnership Opps", "📋 Strategic Recs"])
+    st.markdown("---")
 
-with tab1:
-    col_ent1, col_ent2, col_ent3 = st.columns(3)
-    
-    with col_ent1:
-        st.markdown("""
-        #### 🖤 PineDrama (ByteDance)
-        **Launched:** January 2026  
-        **Threat Level:** 🔴 **CRITICAL**
-        
-        **Strategy:**
-        - Free content (no coins)
-        - Ad-free viewing
-        - TikTok cross-promotion
-        - Aggressive content acquisition
-        
-        **Watch For:**
-        - Exclusive content deals
-        - Creator partnerships
-        - Marketing blitz
-        """)
-    
-    with col_ent2:
-        st.markdown("""
-        #### ✨ GammaTime
-        **Launched:** October 2025  
-        **Threat Level:** 🟠 **HIGH**
-        
-        **Strategy:**
-        - "Hollywood quality" positioning
-        - Celebrity investors
-        - Premium subscription model
-        
-        **Differentiation:**
-        - US-produced content
-        - A-list talent attached
-        - Premium pricing ($9.99/mo)
-        """)
-    
-    with col_ent3:
-        st.markdown("""
-        #### 🦊 Fox + Holywater
-        **Announced:** November 2025  
-        **Threat Level:** 🟠 **MEDIUM-HIGH**
-        
-        **Deal Terms:**
-        - Equity stake in Holywater
-        - 200 shows commitment
-        - US market focus
-        
-        **Competitive Edge:**
-        - Hollywood IP access
-        - Ukraine production efficiency
-        """)
-
-with tab2:
-    col_part1, col_part2 = st.columns(2)
-    
-    with col_part1:
-        st.markdown("""
-        #### 🎬 Content Supply Partners
-        
-        | Company | Strength | Status |
-        |---------|----------|--------|
-        | Crazy Maple Studio | #1 producer | ReelShort exclusive |
-        | StoryMatrix | High volume | DramaBox exclusive |
-        | Vertical Film Vancouver | Western production | Open to deals |
-        | COL Group | Novel adaptations | Seeking partners |
-        | Wattpad / WEBTOON | IP pipeline | Open to licensing |
-        """)
-    
-    with col_part2:
-        st.markdown("""
-        #### 📺 Distribution Partners
-        
-        | Platform | Opportunity | Fit |
-        |----------|-------------|-----|
-        | Tubi | FAST channel | High |
-        | Pluto TV | Dedicated channel | High |
-        | YouTube Shorts | Discovery funnel | Medium |
-        | Roku Channel | Growing FAST | Medium |
-        """)
-
-with tab3:
-    col_rec1, col_rec2 = st.columns(2)
-    
-    with col_rec1:
-        st.markdown("""
-        #### 🎯 Immediate Actions (30 Days)
-        
-        1. **Weekly PineDrama Monitoring**
-           - Track downloads/rankings daily
-           - Report significant movements
-        
-        2. **Evaluate Non-Exclusive Suppliers**
-           - Vertical Film Vancouver
-           - Independent Korean studios
-        
-        3. **Genre Diversification**
-           - Revenge content (+85% growth)
-           - Thriller/Horror underserved
-        """)
-    
-    with col_rec2:
-        st.markdown("""
-        #### 📈 Strategic Initiatives (90 Days)
-        
-        1. **Content Strategy**
-           - Increase revenge/justice mix
-           - Pilot true crime format
-        
-        2. **Distribution Expansion**
-           - FAST channel pilot
-           - YouTube Shorts strategy
-        
-        3. **Partnership Development**
-           - Explore studio JV models
-        """)
+# ============================================
+# RAW DATA & EXPORT
+# ============================================
 
-st.markdown("---")
+def raw_data():
+    run_timer.start("Raw Data", rows=sum(len(df) for df in data.values()))
+
+    st.subheader("📋 View & Export Raw Data")
+    raw_data_view()
+
+    run_timer.stop()
+
+@st.fragment
+def raw_data_view():
+    """
+    One tab's table at a time, so only the table being looked at is sent to
+    the browser; switching tabs re-runs just this fragment
+    """
+    tab = st.segmented_control("Tab", list(RAW_DATA_LABELS), default="platforms", format_func=str.title,
+                               key="raw_data_tab") or "platforms"
+    paged_dataframe(data[tab], f"raw_{tab}", use_container_width=True)
+    export_buttons(tab, data[tab], RAW_DATA_LABELS[tab])
+
+    export_cache = get_export_cache()
+    bundle_version = tab_version(tab_hashes, *data)
+    st.download_button("📦 Download All Tabs (ZIP)",
+                       lambda: export_cache.bundle(bundle_version, {EXPORT_STEMS[tab]: df for tab, df in data.items()},
+                                                   export_versions()),
+                       f"microdrama_all_{datetime.now().strftime('%Y%m%d')}{BUNDLE['suffix']}", BUNDLE["mime"],
+                       on_click="ignore")
+
+# Download button labels per tab (kept from the original CSV buttons)
+RAW_DATA_LABELS = {"platforms": "Platform Data", "titles": "Titles Data", "genres": "Genre Data",
+                   "regions": "Regional Data"}
 
 # ============================================
-# RAW DATA & EXPORT
+# PAGES
 # ============================================
 
-with st.expander("📋 View & Export Raw Data"):
-    data_tab1, data_tab2, data_tab3, data_tab4 = st.tabs(["Platforms", "Titles", "Genres", "Regions"])
-    
-    with data_tab1:
-        st.dataframe(df_platforms, use_container_width=True)
-        st.download_button("📥 Download Platform Data", df_platforms.to_csv(index=False),
-                          f"microdrama_platforms_{datetime.now().strftime('%Y%m%d')}.csv", "text/csv")
-    
-    with data_tab2:
-        st.dataframe(df_titles, use_container_width=True)
-        st.download_button("📥 Download Titles Data", df_titles.to_csv(index=False),
-                          f"microdrama_titles_{datetime.now().strftime('%Y%m%d')}.csv", "text/csv")
-    
-    with data_tab3:
-        st.dataframe(df_genres, use_container_width=True)
-        st.download_button("📥 Download Genre Data", df_genres.to_csv(index=False),
-                          f"microdrama_genres_{datetime.now().strftime('%Y%m%d')}.csv", "text/csv")
-    
-    with data_tab4:
-        st.dataframe(df_regions, use_container_width=True)
-        st.download_button("📥 Download Regional Data", df_regions.to_csv(index=False),
-                          f"microdrama_regional_{datetime.now().strftime('%Y%m%d')}.csv", "text/csv")
+# Only the selected page's sections run; the data, filters and sidebar above
+# are shared by every page
+
+def overview_page():
+    top_metrics()
+    platform_rankings()
+    trending_content()
+
+def markets_page():
+    genre_analysis()
+    regional_breakdown()
+
+page = st.navigation([
+    st.Page(overview_page, title="Overview", icon="📈", url_path="overview", default=True),
+    st.Page(markets_page, title="Genres & Regions", icon="📊", url_path="markets"),
+    st.Page(competitive_intelligence, title="Competitive Intelligence", icon="🎯", url_path="competition"),
+    st.Page(raw_data, title="Raw Data & Export", icon="📋", url_path="raw-data"),
+])
+page.run()
 
 # ============================================
 # FOOTER
@@ -593,3 +768,25 @@ st.markdown("""
     <p>Built by <strong>Vinitha Nair</strong> | 📧 vinithanair.v1@gmail.com</p>
 </div>
 """, unsafe_allow_html=True)
+
+# ============================================
+# PERFORMANCE (open with ?debug=1)
+# ============================================
+
+perf_stats = get_perf_stats()
+perf_stats.record(run_timer, version=snapshot["version"] if snapshot is not None else "default")
+
+if st.query_params.get("debug"):
+    with st.sidebar:
+        with st.expander("⏱️ Performance", expanded=True):
+            st.dataframe(pd.DataFrame(perf_stats.summary()), use_container_width=True, hide_index=True,
+                         column_config={
+                             "mean_ms": st.column_config.NumberColumn("mean ms", format="%.1f"),
+                             "p95_ms": st.column_config.NumberColumn("p95 ms", format="%.1f"),
+                             "max_ms": st.column_config.NumberColumn("max ms", format="%.1f"),
+                             "payload_kb": st.column_config.NumberColumn("payload KB", format="%.1f"),
+                         })
+            if refresher is not None and refresher.last_duration is not None:
+                st.caption(f"Last sheet refresh took {refresher.last_duration:.2f}s "
+                           f"({', '.join(refresher.last_changed) or 'no'} tabs changed)")
+            st.caption(f"{perf_stats.runs} run(s) recorded" + (f" · log: `{METRICS_LOG}`" if METRICS_LOG else ""))
@@ -0,0 +1,81 @@
+"""
+Benchmark: history store writes and range queries at scale.
+
+Records ``--weeks`` weekly versions of a synthetic platforms tab with
+``--apps`` rows each, then times the queries the dashboard makes: one
+platform's last 52 weeks, the previous week's ranks, and every platform
+over a recent window.
+
+USAGE:
+    python benchmarks/bench_history.py
+    python benchmarks/bench_history.py --apps 5000 --weeks 156
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_loader import load_default_data  # noqa: E402
+from history import HistoryStore, week_of  # noqa: E402
+from momentum import platform_momentum  # noqa: E402
+from schema import apply_schema  # noqa: E402
+from synthetic import synthetic_platforms, synthetic_titles  # noqa: E402
+
+WEEK = 7 * 24 * 3600
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--apps", type=int, default=5_000)
+    parser.add_argument("--weeks", type=int, default=156)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    defaults = load_default_data()
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as folder:
+        store = HistoryStore(os.path.join(folder, "history.sqlite3"))
+        platforms = apply_schema("platforms", synthetic_platforms(args.apps))
+        titles = apply_schema("titles", synthetic_titles(args.apps))
+        now = time.time()
+
+        start = time.perf_counter()
+        for week in range(args.weeks):
+            platforms["rank_current"] = rng.permutation(args.apps) + 1
+            saved_at = now - (args.weeks - 1 - week) * WEEK
+            store.record({"version": f"v{week}", "saved_at": saved_at,
+                          "data": {**defaults, "platforms": platforms, "titles": titles}})
+        write_s = time.perf_counter() - start
+        rows = args.apps * args.weeks
+        print(f"recorded {rows:,} platform rows in {write_s:.2f}s ({rows / write_s:,.0f} rows/s)")
+
+        names = platforms["platform"].astype(str).to_numpy()
+        this_week = week_of(now)
+        queries = {
+            "one platform, 52 weeks": lambda: store.platform_series(rng.choice(names), 52),
+            "previous week's ranks": lambda: store.previous_ranks(this_week),
+            "all platforms, 4 weeks": lambda: store.platform_weeks(4),
+            "momentum, 52 weeks": lambda: platform_momentum(store.platform_weeks(52)),
+        }
+        for label, query in queries.items():
+            print(f"{label:>24}: {best_of(query, args.repeat) * 1000:8.2f} ms")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
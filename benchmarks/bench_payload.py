@@ -0,0 +1,108 @@
+"""
+Benchmark: bytes each chart and table sends to the browser, before and after
+the payload trimming.
+
+For each size every tab gets that many rows (see synthetic.py). "before" is
+the chart drawn over every row and the whole table; "after" is what the
+dashboard sends now: charts cut to the top ``DEFAULT_TOP_N`` and passed
+through ``charts.compact``, and tables cut to their first page of
+``TABLE_PAGE_ROWS`` rows (see ``transforms.table_page``). Charts are
+measured as Plotly JSON, tables as the Arrow stream ``st.dataframe`` sends
+(see perf.py).
+
+USAGE:
+    python benchmarks/bench_payload.py
+    python benchmarks/bench_payload.py --sizes 10 100000 --json payload.json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import charts  # noqa: E402
+from config import DEFAULT_TOP_N, TABLE_PAGE_ROWS  # noqa: E402
+from cube import market_cubes  # noqa: E402
+from data_loader import TABS  # noqa: E402
+from perf import payload_size, table_payload_size  # noqa: E402
+from schema import apply_schema  # noqa: E402
+from synthetic import synthetic_data  # noqa: E402
+from transforms import build_rankings_table, genre_counts, table_page, title_breakdown  # noqa: E402
+
+SIZES = [10, 1_000, 100_000]
+
+
+def figures(data, top_n):
+    """Every chart on the dashboard, by name, with ``top_n`` bars / slices"""
+    df_platforms, df_titles = data["platforms"], data["titles"]
+    df_genres, df_regions = data["genres"], data["regions"]
+    return {
+        "revenue_by_platform": lambda: charts.revenue_by_platform(df_platforms, top_n=top_n),
+        "us_share_by_platform": lambda: charts.us_share_by_platform(df_platforms, top_n=top_n),
+        "top_titles": lambda: charts.top_titles(df_titles, top_n=top_n),
+        "genre_mix": lambda: charts.genre_mix(genre_counts(market_cubes(data)["titles"])),
+        "genre_market_share": lambda: charts.genre_bar(df_genres, 'market_share', 'Market Share (%)', 'Purples',
+                                                       top_n=top_n),
+        "genre_growth": lambda: charts.genre_bar(df_genres, 'growth_rate', 'YoY Growth Rate (%)', 'Oranges',
+                                                 top_n=top_n),
+        "region_share": lambda: charts.region_share(df_regions, top_n=top_n),
+        "region_growth": lambda: charts.region_growth(df_regions, top_n=top_n),
+    }
+
+
+def tables(data):
+    """Every table on the dashboard, by name, in full"""
+    return {
+        "rankings": build_rankings_table(data["platforms"]),
+        "drill_down": title_breakdown(market_cubes(data)["titles"], ["genre", "platform"]),
+        "regions": data["regions"],
+        **{f"raw_{tab}": data[tab] for tab in TABS},
+    }
+
+
+def measure(rows, seed=0):
+    """One result dict per chart and table at ``rows`` rows per tab"""
+    data = {tab: apply_schema(tab, df) for tab, df in synthetic_data(rows, seed).items()}
+    results = []
+    before, after = figures(data, None), figures(data, DEFAULT_TOP_N)
+    for name in before:
+        results.append({"rows": rows, "kind": "chart", "name": name, "before_bytes": payload_size(before[name]()),
+                        "after_bytes": payload_size(charts.compact(after[name]()))})
+    for name, df in tables(data).items():
+        results.append({"rows": rows, "kind": "table", "name": name, "before_bytes": table_payload_size(df),
+                        "after_bytes": table_payload_size(table_page(df, 1, TABLE_PAGE_ROWS))})
+    return results
+
+
+def kilobytes(n):
+    return f"{n / 1024:,.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="Write the results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'rows':>8} {'payload':>22} {'before (KB)':>12} {'after (KB)':>11} {'saved':>7}")
+    for rows in args.sizes:
+        measured = measure(rows, args.seed)
+        results.extend(measured)
+        for r in measured + [{"name": "total", "before_bytes": sum(m["before_bytes"] for m in measured),
+                              "after_bytes": sum(m["after_bytes"] for m in measured)}]:
+            saved = 1 - r["after_bytes"] / r["before_bytes"] if r["before_bytes"] else 0
+            print(f"{rows:>8} {r['name']:>22} {kilobytes(r['before_bytes']):>12} {kilobytes(r['after_bytes']):>11} "
+                  f"{saved:>7.0%}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"seed": args.seed, "top_n": DEFAULT_TOP_N, "page_rows": TABLE_PAGE_ROWS, "results": results},
+                      f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Benchmark: the dashboard pipeline, stage by stage, on synthetic data.
+
+For each size every tab gets that many rows (see synthetic.py) and these
+stages are timed separately, as the app runs them:
+
+    csv_parse     read_csv + schema coercion of all four tabs
+    cube          building the genre x platform x origin rollup cubes
+    aggregations  KPI tiles, genre counts and the content breakdown, sliced
+                  from the cubes to half the genres
+    rankings      the formatted Platform Rankings table (df_display)
+    filter_index  building the filter codes and title search index
+    filter_apply  a selection of half the platforms and genres with a title
+                  search
+    figures       every chart on the page
+    csv_export    CSV download payload of all four tabs
+
+Results are printed as a table and can be written as JSON with --json. Pass
+an earlier JSON file as --baseline to fail (exit code 1) when any stage got
+slower than the tolerance allows.
+
+USAGE:
+    python benchmarks/bench_pipeline.py --json results.json
+    python benchmarks/bench_pipeline.py --sizes 10 1000 100000 --baseline results.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+import plotly
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import charts  # noqa: E402
+from config import DEFAULT_TOP_N  # noqa: E402
+from data_loader import TABS  # noqa: E402
+from exports import write_csv  # noqa: E402
+from cube import market_cubes  # noqa: E402
+from filters import FilterIndex  # noqa: E402
+from schema import apply_schema  # noqa: E402
+from synthetic import synthetic_data  # noqa: E402
+from transforms import build_rankings_table, content_breakdown, genre_counts, kpi_tiles  # noqa: E402
+
+SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+
+# Stage timings below this many seconds are too noisy to flag as regressions
+MIN_COMPARABLE_SECONDS = 0.005
+
+
+def stage_csv_parse(payloads):
+    return {tab: apply_schema(tab, pd.read_csv(io.BytesIO(payloads[tab]))) for tab in TABS}
+
+
+# The app builds the cubes and the filter index once per data version, so
+# the stages reading them reuse one per data set instead of timing the
+# build again
+_built = {}
+
+
+def built(build, data):
+    key = (build, id(data))
+    if key not in _built:
+        _built[key] = build(data)
+    return _built[key]
+
+
+def stage_cube(data):
+    return market_cubes(data)
+
+
+def half(values):
+    """Every other value, so a selection keeps a fair share of the rows at any size"""
+    return list(values)[::2]
+
+
+def stage_aggregations(data):
+    cubes = built(market_cubes, data)
+    titles = cubes["titles"].slice({"genre": half(data["genres"]["genre"].astype(str))})
+    counts = genre_counts(titles)
+    return kpi_tiles(cubes["platforms"]), content_breakdown(titles, counts)
+
+
+def stage_rankings(data):
+    return build_rankings_table(data["platforms"])
+
+
+def stage_filter_index(data):
+    return FilterIndex(data)
+
+
+def uncached_filter_index(data):
+    # Without the view cache every repeat computes the masks and frames
+    return FilterIndex(data, max_views=0)
+
+
+def stage_filter_apply(data):
+    index = built(uncached_filter_index, data)
+    selection = {name: half(index.options(name)) for name in ("platform", "genre")}
+    return index.apply(data, selection, "title 1")
+
+
+def stage_figures(data):
+    df_platforms, df_titles = data["platforms"], data["titles"]
+    df_genres, df_regions = data["genres"], data["regions"]
+    return [
+        charts.revenue_by_platform(df_platforms, top_n=DEFAULT_TOP_N),
+        charts.us_share_by_platform(df_platforms, top_n=DEFAULT_TOP_N),
+        charts.top_titles(df_titles, top_n=DEFAULT_TOP_N),
+        charts.genre_mix(genre_counts(built(market_cubes, data)["titles"])),
+        charts.genre_bar(df_genres, 'market_share', 'Market Share (%)', 'Purples', top_n=DEFAULT_TOP_N),
+        charts.genre_bar(df_genres, 'growth_rate', 'YoY Growth Rate (%)', 'Oranges', top_n=DEFAULT_TOP_N),
+        charts.genre_bar(df_genres, 'avg_completion', 'Completion Rate (%)', 'Greens', top_n=DEFAULT_TOP_N),
+        charts.region_share(df_regions, top_n=DEFAULT_TOP_N),
+        charts.region_growth(df_regions, top_n=DEFAULT_TOP_N),
+    ]
+
+
+def stage_csv_export(data):
+    sizes = {}
+    for tab in TABS:
+        buffer = io.BytesIO()
+        write_csv(data[tab], buffer)
+        sizes[tab] = buffer.tell()
+    return sizes
+
+
+STAGES = {
+    "csv_parse": stage_csv_parse,
+    "cube": stage_cube,
+    "aggregations": stage_aggregations,
+    "rankings": stage_rankings,
+    "filter_index": stage_filter_index,
+    "filter_apply": stage_filter_apply,
+    "figures": stage_figures,
+    "csv_export": stage_csv_export,
+}
+
+
+def timed(fn, arg, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(arg)
+        times.append(time.perf_counter() - start)
+    return times, result
+
+
+def run(sizes, repeat, seed=0, stages=tuple(STAGES)):
+    """One result dict per (size, stage)"""
+    results = []
+    for n in sizes:
+        raw = synthetic_data(n, seed)
+        payloads = {tab: raw[tab].to_csv(index=False).encode("utf-8") for tab in TABS}
+        # Later stages run on the typed frames, as in the app
+        data = stage_csv_parse(payloads)
+        for stage in stages:
+            times, _ = timed(STAGES[stage], payloads if stage == "csv_parse" else data, repeat)
+            results.append({"rows": n, "stage": stage, "best_s": min(times),
+                            "median_s": statistics.median(times), "repeat": repeat})
+    return results
+
+
+def environment():
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "plotly": plotly.__version__,
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def regressions(results, baseline, tolerance):
+    """(rows, stage, before, after) for every stage that got slower than allowed"""
+    before = {(r["rows"], r["stage"]): r["best_s"] for r in baseline["results"]}
+    slower = []
+    for r in results:
+        old = before.get((r["rows"], r["stage"]))
+        if old is None or old < MIN_COMPARABLE_SECONDS:
+            continue
+        if r["best_s"] > old * (1 + tolerance):
+            slower.append((r["rows"], r["stage"], old, r["best_s"]))
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="Write the results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="Earlier --json output to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slow-down against the baseline, as a fraction (default 0.25)")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat, args.seed, args.stages)
+
+    print(f"{'rows':>10} {'stage':>14} {'best (ms)':>11} {'median (ms)':>12}")
+    for r in results:
+        print(f"{r['rows']:>10} {r['stage']:>14} {r['best_s'] * 1000:>11.2f} {r['median_s'] * 1000:>12.2f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"environment": environment(), "seed": args.seed, "results": results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            slower = regressions(results, json.load(f), args.tolerance)
+        for rows, stage, old, new in slower:
+            print(f"REGRESSION {stage} @ {rows} rows: {old * 1000:.2f} ms -> {new * 1000:.2f} ms")
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: Platform Rankings table, row-wise apply vs vectorised builder.
+
+Builds a synthetic platforms tab at increasing sizes (with downloads on the
+rounding edges of each unit), checks both builders produce identical
+tables, and prints the timings. The legacy builder gets the frame as pandas
+would guess it from CSV, the new one the schema-typed frame the app
+actually uses.
+
+USAGE:
+    python benchmarks/bench_rankings.py
+    python benchmarks/bench_rankings.py --sizes 10 1000 100000 1000000 --repeat 3
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from schema import apply_schema  # noqa: E402
+from synthetic import synthetic_platforms  # noqa: E402
+from transforms import build_rankings_table, format_number, get_rank_change_indicator  # noqa: E402
+
+
+def legacy_rankings_table(df_platforms):
+    """The original row-wise implementation, kept as the reference"""
+    df_display = df_platforms.copy()
+    df_display['change'] = df_display.apply(lambda x: get_rank_change_indicator(x['rank_current'], x['rank_last_week']), axis=1)
+    df_display['downloads_fmt'] = df_display['installs'].apply(format_number)
+    df_display['revenue_fmt'] = df_display['revenue_q1_2025'].apply(lambda x: f"${x}M")
+    df_display['rating_fmt'] = df_display['score'].apply(lambda x: f"{x} ⭐")
+    df_display['us_share_fmt'] = df_display['us_share'].apply(lambda x: f"{x}%")
+
+    display_cols = df_display[[
+        'rank_current', 'change', 'platform', 'company', 'origin',
+        'downloads_fmt', 'revenue_fmt', 'rating_fmt', 'us_share_fmt',
+        'content_count', 'threat_level'
+    ]].sort_values('rank_current')
+
+    display_cols.columns = ['Rank', 'Δ', 'Platform', 'Company', 'Origin', 'Downloads', 'Q1 Revenue', 'Rating', 'US Share', 'Titles', 'Status']
+    return display_cols
+
+
+# Downloads on the rounding edges of each unit, written over the first rows
+EDGE_INSTALLS = [1_050_000_000, 1_150_000_000, 2_250_000_000, 999_999_999, 2_500_000, 1_500]
+
+
+def with_edge_values(raw):
+    """``raw`` with its first rows' installs set to ``EDGE_INSTALLS``"""
+    raw = raw.copy()
+    edges = EDGE_INSTALLS[:len(raw)]
+    raw.loc[:len(edges) - 1, "installs"] = edges
+    return raw
+
+
+def best_of(fn, arg, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(arg)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'apply (ms)':>12} {'vectorised (ms)':>16} {'speed-up':>9}")
+    for n in args.sizes:
+        raw = with_edge_values(synthetic_platforms(n))
+        typed = apply_schema("platforms", raw)
+        legacy_s, legacy = best_of(legacy_rankings_table, raw, args.repeat)
+        fast_s, fast = best_of(build_rankings_table, typed, args.repeat)
+        pd.testing.assert_frame_equal(legacy.astype(str), fast.astype(str))
+        print(f"{n:>10} {legacy_s * 1000:>12.2f} {fast_s * 1000:>16.2f} {legacy_s / fast_s:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Benchmark: how many simultaneous viewers one app process can hold.
+
+Drives ``--sessions`` simulated viewers through app2.py headlessly with
+Streamlit's ``AppTest``, on synthetic data of each ``--sizes`` (rows per
+tab, see synthetic.py) read as local CSV sources. Every viewer is a
+separate session with its own session state and widget values, and all of
+them stay alive together while they step through the same script:
+
+    load          first visit (Overview page)
+    filter        pick a platform in the sidebar
+    search        type a title search
+    markets       open the Genres & Regions page
+    raw_data      open the Raw Data & Export page
+    raw_titles    show the titles table (a fragment rerun)
+    reset         clear the filters and go back to the Overview
+
+Viewers take turns step by step, so their reruns interleave the way a busy
+server's would and each one hits the caches the others left behind.
+``AppTest`` installs a process-wide runtime for each rerun, so reruns are
+timed one at a time: the latencies are service times, and reruns/s is the
+most one process can serve before viewers start queueing.
+
+Each (size, sessions) pair runs in a fresh process, after one warm-up
+viewer has filled the shared caches, so the numbers don't carry over from
+the previous level. MB/session is the RSS growth from the warm process to
+the one holding every viewer, divided by the number of viewers.
+
+USAGE:
+    python benchmarks/bench_sessions.py
+    python benchmarks/bench_sessions.py --sizes 1000 100000 --sessions 1 10 50 --json sessions.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_loader import TABS  # noqa: E402
+from synthetic import synthetic_data  # noqa: E402
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app2.py")
+
+SIZES = [1_000, 100_000]
+SESSIONS = [1, 5, 10, 25]
+
+SEARCH = "love"
+
+
+def rss_mb():
+    """Current resident set size (Linux), or the peak where /proc isn't available"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except OSError:
+        return peak_rss_mb()
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def open_page(at, title):
+    # AppTest.switch_page only knows file-based pages; ours are callables,
+    # so pick the hash st.navigation registered for the page's title
+    at._page_hash = next(page_hash for page_hash, info in at._registered_pages.items()
+                         if info.get("page_name") == title)
+    return at
+
+
+def step_load(at, i):
+    return at
+
+
+def step_filter(at, i):
+    platforms = at.multiselect(key="filter_platform")
+    return platforms.select(platforms.options[i % len(platforms.options)])
+
+
+def step_search(at, i):
+    return at.text_input(key="filter_search").input(SEARCH)
+
+
+def step_markets(at, i):
+    return open_page(at, "Genres & Regions")
+
+
+def step_raw_data(at, i):
+    return open_page(at, "Raw Data & Export")
+
+
+def step_raw_titles(at, i):
+    return at.get("button_group")[0].set_value("titles")
+
+
+def step_reset(at, i):
+    at.multiselect(key="filter_platform").set_value([])
+    at.text_input(key="filter_search").input("")
+    return open_page(at, "Overview")
+
+
+STEPS = {
+    "load": step_load,
+    "filter": step_filter,
+    "search": step_search,
+    "markets": step_markets,
+    "raw_data": step_raw_data,
+    "raw_titles": step_raw_titles,
+    "reset": step_reset,
+}
+
+
+def write_sources(folder, rows, seed):
+    """Synthetic tabs as CSV files, in the ``LOCAL_SOURCES`` format"""
+    sources = {}
+    for tab, df in synthetic_data(rows, seed).items():
+        path = os.path.join(folder, f"{tab}.csv")
+        df.to_csv(path, index=False)
+        sources[tab] = {"path": path}
+    return sources
+
+
+def drive(sessions, timeout):
+    """Run one warm-up viewer, then ``sessions`` more; returns the worker's result dict"""
+    from streamlit.testing.v1 import AppTest
+
+    def rerun(at, step, i):
+        start = time.perf_counter()
+        STEPS[step](at, i).run()
+        elapsed = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"{step} failed in session {i}: {at.exception[0].value}")
+        return elapsed
+
+    warm = AppTest.from_file(APP, default_timeout=timeout)
+    for step in STEPS:
+        rerun(warm, step, 0)
+    del warm
+    gc.collect()
+    baseline = rss_mb()
+
+    viewers = [AppTest.from_file(APP, default_timeout=timeout) for _ in range(sessions)]
+    latencies = {step: [] for step in STEPS}
+    start = time.perf_counter()
+    for step in STEPS:
+        for i, at in enumerate(viewers):
+            latencies[step].append(rerun(at, step, i))
+    wall = time.perf_counter() - start
+    gc.collect()
+    held = rss_mb()
+    return {"latencies": latencies, "wall_s": wall, "baseline_mb": baseline, "held_mb": held,
+            "peak_mb": peak_rss_mb()}
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def measure(rows, sessions, seed, timeout):
+    """Results of one (rows, sessions) level, measured in a fresh process"""
+    with tempfile.TemporaryDirectory() as folder:
+        env = {**os.environ,
+               "LOCAL_SOURCES": json.dumps(write_sources(folder, rows, seed)),
+               "SNAPSHOT_DIR": os.path.join(folder, "snapshots"),
+               "EXPORT_DIR": os.path.join(folder, "exports"),
+               "HISTORY_PATH": os.path.join(folder, "history.sqlite3"),
+               "METRICS_LOG": os.path.join(folder, "metrics.jsonl")}
+        proc = subprocess.run([sys.executable, __file__, "--worker", str(sessions), "--timeout", str(timeout)],
+                              env=env, capture_output=True, text=True)
+        if proc.returncode:
+            raise RuntimeError(f"{rows} rows x {sessions} sessions failed:\n{proc.stderr[-2000:]}")
+    worker = json.loads(proc.stdout.strip().splitlines()[-1])
+    every = [t for times in worker["latencies"].values() for t in times]
+    return {
+        "rows": rows,
+        "sessions": sessions,
+        "p50_s": percentile(every, 0.50),
+        "p95_s": percentile(every, 0.95),
+        "steps_p50_s": {step: statistics.median(times) for step, times in worker["latencies"].items()},
+        "reruns_per_s": len(every) / worker["wall_s"],
+        "peak_rss_mb": worker["peak_mb"],
+        "mb_per_session": max(0.0, worker["held_mb"] - worker["baseline_mb"]) / sessions,
+    }
+
+
+def environment():
+    import pandas as pd
+    import streamlit
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "streamlit": streamlit.__version__,
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--sessions", type=int, nargs="+", default=SESSIONS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds one rerun may take")
+    parser.add_argument("--json", metavar="PATH", help="Write the results as JSON")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(drive(args.worker, args.timeout)))
+        return
+
+    print(f"{'rows':>8} {'sessions':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'reruns/s':>9} "
+          f"{'peak RSS (MB)':>14} {'MB/session':>11}")
+    results = []
+    for rows in args.sizes:
+        for sessions in args.sessions:
+            r = measure(rows, sessions, args.seed, args.timeout)
+            results.append(r)
+            print(f"{rows:>8} {sessions:>8} {r['p50_s'] * 1000:>9.1f} {r['p95_s'] * 1000:>9.1f} "
+                  f"{r['reruns_per_s']:>9.1f} {r['peak_rss_mb']:>14.0f} {r['mb_per_session']:>11.2f}", flush=True)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"environment": environment(), "seed": args.seed, "tabs": list(TABS), "results": results},
+                      f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
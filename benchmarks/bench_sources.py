@@ -0,0 +1,76 @@
+"""
+Benchmark: reading a large titles export from local CSV, Parquet and SQLite.
+
+Writes ``--rows`` synthetic titles, padded with vendor columns the dashboard
+never reads, to each format. Then times ``sources.read_source`` with and
+without a row filter, against a plain whole-file ``read_csv`` of the CSV. The
+MB column is the in-memory size of the frame the dashboard ends up holding.
+
+USAGE:
+    python benchmarks/bench_sources.py
+    python benchmarks/bench_sources.py --rows 2000000 --chunk-rows 500000
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from schema import apply_schema  # noqa: E402
+from sources import read_source  # noqa: E402
+from synthetic import genre_names, synthetic_titles  # noqa: E402
+
+# Columns a vendor export carries that the dashboard has no use for
+VENDOR_COLUMNS = {"vendor_id": "VND-000000", "synopsis": "A short synopsis of the drama " * 4, "cast": "Lead A, Lead B"}
+
+FILTERS = [("weeks_trending", ">", 10), ("genre", "in", list(genre_names(2)))]
+
+
+def write_sources(folder, rows):
+    raw = synthetic_titles(rows).assign(**VENDOR_COLUMNS)
+    paths = {fmt: os.path.join(folder, f"titles.{fmt}") for fmt in ("csv", "parquet", "sqlite")}
+    raw.to_csv(paths["csv"], index=False)
+    raw.to_parquet(paths["parquet"], row_group_size=100_000)
+    with sqlite3.connect(paths["sqlite"]) as conn:
+        raw.to_sql("titles", conn, index=False, chunksize=100_000)
+    return paths
+
+
+def megabytes(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = write_sources(folder, args.rows)
+        print(f"{'source':>28} {'seconds':>8} {'rows':>9} {'MB':>8}")
+
+        seconds, df = timed(lambda: apply_schema("titles", pd.read_csv(paths["csv"])))
+        print(f"{'csv, whole file':>28} {seconds:>8.2f} {len(df):>9} {megabytes(df):>8.1f}")
+
+        for fmt, path in paths.items():
+            for label, filters in (("", []), (" + filter", FILTERS)):
+                source = {"path": path, "table": "titles", "filters": filters, "chunk_rows": args.chunk_rows}
+                seconds, df = timed(lambda: read_source("titles", source))
+                print(f"{fmt + ', chunked' + label:>28} {seconds:>8.2f} {len(df):>9} {megabytes(df):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Benchmark: cold start, from launching Python to the first rendered page.
+
+Each run starts a fresh interpreter (as a container cold start would) and
+renders app2.py once with Streamlit's ``AppTest``, with every heavy import
+still to do. Three scenarios:
+
+    live      sheets served by sheets_stub.py, nothing saved on disk yet
+    snapshot  the same, restarted with the snapshot the live run saved
+    offline   the sheets endpoint refuses connections, so every tab falls
+              back to the bundled default data
+
+and three times per run, measured from process launch:
+
+    streamlit     Streamlit itself is imported (the server's own start-up)
+    first paint   the first element reaches the browser
+    first render  the whole first page has been sent
+
+The imports the app triggers after Streamlit's own are read from
+``python -X importtime`` and listed by top-level package, heaviest first.
+The run fails (exit code 1) when the median first render or the app's
+imports exceed their budget.
+
+USAGE:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 5 --render-budget 2500 --json startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app2.py")
+
+SCENARIOS = ["live", "snapshot", "offline"]
+
+# Milliseconds; generous enough for a small container, tight enough to
+# catch an eager import of a whole library or a blocking load
+RENDER_BUDGET_MS = 4000
+IMPORT_BUDGET_MS = 1500
+
+# Printed to stderr between Streamlit's imports and the app's
+APP_IMPORTS_MARKER = "bench_startup: app imports follow"
+
+
+def worker(timeout):
+    """Render the app once; prints the times (``time.time()``) as JSON"""
+    times = {}
+    from streamlit.testing.v1 import AppTest
+    from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+    times["streamlit"] = time.time()
+    print(APP_IMPORTS_MARKER, file=sys.stderr, flush=True)
+
+    # Note when the first element is queued for the browser
+    original_init = LocalScriptRunner.__init__
+
+    def init(runner, *args, **kwargs):
+        original_init(runner, *args, **kwargs)
+        enqueue = runner.forward_msg_queue.enqueue
+
+        def timed_enqueue(msg):
+            if msg.HasField("delta"):
+                times.setdefault("first_paint", time.time())
+            enqueue(msg)
+
+        runner.forward_msg_queue.enqueue = timed_enqueue
+
+    LocalScriptRunner.__init__ = init
+    at = AppTest.from_file(APP, default_timeout=timeout).run()
+    times["first_render"] = time.time()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    print(json.dumps(times))
+
+
+def app_imports(importtime_log):
+    """Cumulative ms per top-level package imported after the marker"""
+    packages, started = {}, False
+    for line in importtime_log.splitlines():
+        if APP_IMPORTS_MARKER in line:
+            started = True
+            continue
+        if not started or not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented under the one that pulled them in
+        if name.startswith("  ") or not cumulative.strip().isdigit():
+            continue
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(cumulative) / 1000
+    return packages
+
+
+def launch(scenario, folder, stub, timeout):
+    """One cold start; returns ms since launch per milestone and the app's imports"""
+    from sheets_stub import base_url
+
+    env = {**os.environ,
+           "SNAPSHOT_DIR": os.path.join(folder, "snapshots"),
+           "EXPORT_DIR": os.path.join(folder, "exports"),
+           "HISTORY_PATH": os.path.join(folder, "history.sqlite3"),
+           "METRICS_LOG": os.path.join(folder, "metrics.jsonl"),
+           # Nothing listens on port 9, so every fetch fails at once
+           "SHEETS_BASE_URL": base_url(stub) if scenario != "offline" else "http://127.0.0.1:9"}
+    env.pop("LOCAL_SOURCES", None)
+    if scenario == "offline":
+        env["SNAPSHOT_DIR"] = os.path.join(folder, "offline-snapshots")
+
+    launched = time.time()
+    proc = subprocess.run([sys.executable, "-X", "importtime", __file__, "--worker", "--timeout", str(timeout)],
+                          env=env, capture_output=True, text=True)
+    if proc.returncode:
+        raise RuntimeError(f"{scenario} start failed:\n{proc.stderr[-2000:]}")
+    times = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {name: (at - launched) * 1000 for name, at in times.items()}, app_imports(proc.stderr)
+
+
+def run(scenarios, repeat, timeout):
+    from sheets_stub import start_in_background
+
+    stub = start_in_background()
+    results = []
+    try:
+        for _ in range(repeat):
+            # A fresh folder per round, so "live" really starts with no snapshot
+            # and "snapshot" restarts from the one it saved
+            with tempfile.TemporaryDirectory() as folder:
+                for scenario in scenarios:
+                    times, imports = launch(scenario, folder, stub, timeout)
+                    results.append({"scenario": scenario, **times, "app_imports_ms": sum(imports.values()),
+                                    "imports": imports})
+    finally:
+        stub.shutdown()
+    return results
+
+
+def summarise(results):
+    """Median of each milestone per scenario"""
+    summary = {}
+    for scenario in dict.fromkeys(r["scenario"] for r in results):
+        runs = [r for r in results if r["scenario"] == scenario]
+        summary[scenario] = {key: statistics.median(r[key] for r in runs)
+                             for key in ("streamlit", "first_paint", "first_render", "app_imports_ms")}
+        heaviest = {}
+        for r in runs:
+            for package, ms in r["imports"].items():
+                heaviest.setdefault(package, []).append(ms)
+        summary[scenario]["imports"] = dict(sorted(((p, statistics.median(v)) for p, v in heaviest.items()),
+                                                   key=lambda item: -item[1]))
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds the first render may take")
+    parser.add_argument("--render-budget", type=float, default=RENDER_BUDGET_MS,
+                        help=f"Median first render allowed, in ms (default {RENDER_BUDGET_MS})")
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET_MS,
+                        help=f"Median time allowed in the app's own imports, in ms (default {IMPORT_BUDGET_MS})")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest imports to list per scenario")
+    parser.add_argument("--json", metavar="PATH", help="Write the results as JSON")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.timeout)
+        return
+
+    summary = summarise(run(args.scenarios, args.repeat, args.timeout))
+
+    print(f"{'scenario':>9} {'streamlit':>10} {'first paint':>12} {'first render':>13} {'app imports':>12}  (ms)")
+    over = []
+    for scenario, s in summary.items():
+        print(f"{scenario:>9} {s['streamlit']:>10.0f} {s['first_paint']:>12.0f} {s['first_render']:>13.0f} "
+              f"{s['app_imports_ms']:>12.0f}")
+        print(" " * 10 + "heaviest imports: " + ", ".join(f"{package} {ms:.0f}"
+                                                       for package, ms in list(s["imports"].items())[:args.top]))
+        if s["first_render"] > args.render_budget:
+            over.append(f"{scenario}: first render {s['first_render']:.0f} ms > {args.render_budget:.0f} ms")
+        if s["app_imports_ms"] > args.import_budget:
+            over.append(f"{scenario}: app imports {s['app_imports_ms']:.0f} ms > {args.import_budget:.0f} ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"render_budget_ms": args.render_budget, "import_budget_ms": args.import_budget,
+                       "repeat": args.repeat, "summary": summary}, f, indent=2)
+
+    for line in over:
+        print(f"OVER BUDGET {line}")
+    if over:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Seeded synthetic dashboard data for the benchmarks.
+
+Each generator returns a frame with the tab's columns (see ``schema.SCHEMAS``)
+in the untyped form pandas would produce from a CSV export of the sheet, so
+the schema coercion is part of what gets measured. Titles and regions point
+at the generated platforms and genres (the first ``PLATFORM_POOL`` /
+``GENRE_POOL`` of them, so a catalog of any size has realistically few), so
+joins and filters across tabs match rows; other labels are drawn from the default data, and measures are
+random but in realistic ranges. The same ``n`` and ``seed`` always give the
+same frame.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_loader import TABS, load_default_data  # noqa: E402
+
+
+def _base(tab, n, rng):
+    """``n`` rows sampled from the default tab, as plain object columns"""
+    base = load_default_data()[tab].astype(object)
+    return base.iloc[rng.integers(0, len(base), n)].reset_index(drop=True)
+
+
+# Distinct platforms and genres titles and regions are spread over; a real
+# catalog grows in titles, not in apps or genres
+PLATFORM_POOL = 100
+GENRE_POOL = 50
+
+
+def platform_names(n):
+    """Platform names of ``synthetic_platforms(n)``"""
+    return np.array([f"App {i}" for i in range(n)], dtype=object)
+
+
+def genre_names(n):
+    """Genre names of ``synthetic_genres(n)``"""
+    return np.array([f"Genre {i}" for i in range(n)], dtype=object)
+
+
+def _views_text(views):
+    """View counts written the way the sheet has them: "180M", "1.2B", "950K" """
+    out = np.where(views >= 1_000_000_000, np.char.add(np.round(views / 1e9, 1).astype(str), "B"),
+                   np.where(views >= 1_000_000, np.char.add((views // 1_000_000).astype(str), "M"),
+                            np.char.add((views // 1_000).astype(str), "K")))
+    return out.astype(object)
+
+
+def synthetic_platforms(n, seed=0):
+    rng = np.random.default_rng(seed)
+    df = _base("platforms", n, rng)
+    df["platform"] = platform_names(n)
+    df["installs"] = rng.integers(0, 3_000_000_000, n)
+    df["revenue_2024"] = rng.integers(0, 2_000, n)
+    df["revenue_q1_2025"] = rng.integers(0, 500, n)
+    df["score"] = rng.integers(30, 50, n) / 10
+    df["us_share"] = rng.integers(0, 1000, n) / 10
+    df["rank_current"] = rng.permutation(n) + 1
+    df["rank_last_week"] = np.clip(df["rank_current"] + rng.integers(-5, 6, n), 1, None)
+    df["content_count"] = rng.integers(10, 5_000, n)
+    return df.infer_objects()
+
+
+def synthetic_titles(n, seed=0):
+    rng = np.random.default_rng(seed + 1)
+    df = _base("titles", n, rng)
+    df["title"] = [f"Title {i}" for i in range(n)]
+    df["platform"] = rng.choice(platform_names(min(n, PLATFORM_POOL)), n)
+    df["genre"] = rng.choice(genre_names(min(n, GENRE_POOL)), n)
+    df["episodes"] = rng.integers(40, 120, n)
+    df["revenue_est"] = rng.integers(0, 30, n)
+    df["views_est"] = _views_text(rng.integers(100_000, 2_000_000_000, n))
+    df["weeks_trending"] = rng.integers(0, 20, n)
+    return df.infer_objects()
+
+
+def synthetic_genres(n, seed=0):
+    rng = np.random.default_rng(seed + 2)
+    df = _base("genres", n, rng)
+    df["genre"] = genre_names(n)
+    df["market_share"] = rng.integers(0, 500, n) / 10
+    df["growth_rate"] = rng.integers(-200, 1000, n) / 10
+    df["avg_completion"] = rng.integers(300, 950, n) / 10
+    return df.infer_objects()
+
+
+def synthetic_regions(n, seed=0):
+    rng = np.random.default_rng(seed + 3)
+    df = _base("regions", n, rng)
+    df["region"] = [f"Region {i}" for i in range(n)]
+    df["top_platform"] = rng.choice(platform_names(min(n, PLATFORM_POOL)), n)
+    df["market_share"] = rng.integers(0, 500, n) / 10
+    df["revenue_q1"] = rng.integers(0, 400, n)
+    df["growth"] = rng.integers(-50, 500, n)
+    return df.infer_objects()
+
+
+GENERATORS = {
+    "platforms": synthetic_platforms,
+    "titles": synthetic_titles,
+    "genres": synthetic_genres,
+    "regions": synthetic_regions,
+}
+
+
+def synthetic_data(n, seed=0):
+    """All four tabs with ``n`` rows each, untyped"""
+    return {tab: GENERATORS[tab](n, seed) for tab in TABS}
@@ -0,0 +1,87 @@
+"""
+Circuit breaker for the Google Sheets endpoint.
+
+The refresher already backs off per tab, but when Google itself is down
+or slow every tab still waits out its full timeout, and "Refresh now"
+blocks the viewer who clicked it. The breaker fails those calls fast:
+
+    closed     calls go through; ``failure_threshold`` failed loads in a
+               row open the circuit
+    open       calls are refused at once (the snapshot cache keeps serving
+               the last good data) until the open period ends
+    half-open  one probe call is let through: success closes the circuit,
+               failure re-opens it for twice as long (up to ``max_timeout``)
+"""
+
+import random
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """Thread-safe breaker state shared by the refresher and the page"""
+
+    def __init__(self, failure_threshold=3, reset_timeout=60, max_timeout=1800, jitter=0.1):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_timeout = max_timeout
+        self.jitter = jitter
+
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.last_error = None
+        self.opened_at = None
+        self.retry_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Whether a call may go out now. An expired open period turns into
+        half-open here, and exactly one caller gets to probe.
+        """
+        with self._lock:
+            if self.state == OPEN and time.time() >= self.retry_at:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN:
+                if self._probing:
+                    return False
+                self._probing = True
+                return True
+            return self.state == CLOSED
+
+    def record(self, ok, error=None):
+        """Outcome of a call that ``allow`` let through"""
+        with self._lock:
+            self._probing = False
+            if ok:
+                self.state, self.failures, self.trips = CLOSED, 0, 0
+                self.last_error = self.retry_at = self.opened_at = None
+                return
+            self.failures += 1
+            self.last_error = error
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self.trips += 1
+        timeout = min(self.reset_timeout * 2 ** (self.trips - 1), self.max_timeout)
+        self.state = OPEN
+        self.opened_at = time.time()
+        self.retry_at = self.opened_at + timeout * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def describe(self):
+        """One line for status messages, e.g. "circuit open, next try in 2 min" """
+        with self._lock:
+            if self.state == OPEN:
+                wait_s = max(0, self.retry_at - time.time())
+                wait = f"{wait_s:.0f}s" if wait_s < 120 else f"{wait_s / 60:.0f} min"
+                return f"circuit open after {self.failures} failed loads, next try in {wait}"
+            if self.state == HALF_OPEN:
+                return "circuit half-open, probing"
+            return "circuit closed"
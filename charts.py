@@ -0,0 +1,213 @@
+"""
+Plotly figure builders for the dashboard, plus a per-version figure cache.
+
+The builders are plain functions of the data frames so the Streamlit app and
+offline tooling draw exactly the same charts. Plotly Express is imported on
+the first chart drawn (see ``px``), so pages without charts never load it.
+"""
+
+import importlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from transforms import top_n_with_other
+
+PLATFORM_COLORS = {
+    "ReelShort": "#ef4444",
+    "DramaBox": "#8b5cf6",
+    "ShortMax": "#f59e0b",
+    "GoodShort": "#10b981",
+    "FlexTV": "#3b82f6",
+    "My Drama": "#ec4899",
+    "PineDrama": "#000000",
+    "GammaTime": "#6366f1",
+    "Vigloo": "#14b8a6",
+    "MoboReels": "#f97316",
+}
+
+# Colour of the roll-up bar / slice holding everything outside the top N
+OTHER_COLOR = "#94a3b8"
+
+# Genre measures that add up across genres, so the genres outside the top N
+# can be rolled into one "Other" bar; rates are just cut off
+ADDITIVE_GENRE_MEASURES = {"market_share"}
+
+# Decimals kept in the data sent to the browser; no chart shows more
+CHART_DECIMALS = 2
+
+
+class _LazyModule:
+    """Stands in for a module and imports it on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(importlib.import_module(self._name), attr)
+
+
+# Streamlit already imports plotly itself; plotly.express (about 150 ms more)
+# is only needed once a chart is drawn
+px = _LazyModule("plotly.express")
+
+
+# ============================================
+# FIGURE BUILDERS
+# ============================================
+
+def revenue_by_platform(df_platforms, top_n=None):
+    df_revenue = top_n_with_other(df_platforms[df_platforms['revenue_q1_2025'] > 0], 'revenue_q1_2025', top_n,
+                                  {'platform': "Other ({n} platforms)", 'origin': "Other"})
+    # Horizontal bars are drawn bottom-up, so reverse to put the biggest on top
+    # and the roll-up row at the bottom
+    fig = px.bar(df_revenue.iloc[::-1], x='revenue_q1_2025', y='platform', orientation='h', color='origin',
+                 title='Q1 2025 Revenue by Platform ($M)', color_discrete_sequence=px.colors.qualitative.Set2)
+    fig.update_layout(height=400, xaxis_title="Revenue ($M)", yaxis_title="")
+    return fig
+
+
+def us_share_by_platform(df_platforms, top_n=None):
+    df_share = top_n_with_other(df_platforms[df_platforms['us_share'] > 0], 'us_share', top_n,
+                                {'platform': "Other ({n} platforms)"})
+    fig = px.pie(df_share, values='us_share', names='platform', title='US Market Share by Platform',
+                 color_discrete_sequence=px.colors.qualitative.Pastel)
+    fig.update_layout(height=400)
+    return fig
+
+
+def top_titles(df_titles, top_n=None):
+    df_top = top_n_with_other(df_titles, 'revenue_est', top_n,
+                              {'title': "Other ({n} titles)", 'platform': "Other"}, sum_cols=['views_est'])
+    fig = px.bar(df_top.iloc[::-1], x='revenue_est', y='title', color='platform', orientation='h',
+                 title='Top Performing Titles - Estimated Revenue ($M)',
+                 color_discrete_map={**PLATFORM_COLORS, "Other": OTHER_COLOR},
+                 hover_data={'genre': True, 'episodes': True, 'views_est': ':.3~s'})
+    fig.update_layout(height=450, xaxis_title="Estimated Revenue ($M)", yaxis_title="")
+    return fig
+
+
+def genre_mix(genre_counts):
+    fig = px.pie(genre_counts, values='count', names='genre', title='Genre Mix',
+                 color_discrete_sequence=px.colors.qualitative.Set3)
+    fig.update_layout(height=250, margin=dict(t=50, b=0, l=0, r=0))
+    return fig
+
+
+def genre_bar(df_genres, measure, title, color_scale, top_n=None):
+    labels = {'genre': "Other ({n} genres)"} if measure in ADDITIVE_GENRE_MEASURES else None
+    df_bars = top_n_with_other(df_genres, measure, top_n, labels)
+    fig = px.bar(df_bars.iloc[::-1], x=measure, y='genre',
+                 orientation='h', title=title, color=measure, color_continuous_scale=color_scale)
+    fig.update_layout(height=300, showlegend=False)
+    fig.update_coloraxes(showscale=False)
+    return fig
+
+
+def region_share(df_regions, top_n=None):
+    df_share = top_n_with_other(df_regions, 'market_share', top_n, {'region': "Other ({n} regions)"})
+    fig = px.pie(df_share, values='market_share', names='region', title='Global Market Share by Region',
+                 color_discrete_sequence=px.colors.qualitative.Pastel, hole=0.4)
+    fig.update_layout(height=350)
+    return fig
+
+
+def region_growth(df_regions, top_n=None):
+    fig = px.bar(top_n_with_other(df_regions, 'growth', top_n, None).iloc[::-1], x='growth', y='region', orientation='h',
+                 title='YoY Growth Rate by Region (%)', color='growth', color_continuous_scale='Blues', text='growth')
+    fig.update_traces(texttemplate='%{text}%', textposition='outside')
+    fig.update_layout(height=350, showlegend=False)
+    fig.update_coloraxes(showscale=False)
+    return fig
+
+
+def _compact_value(value):
+    if isinstance(value, float) and np.isfinite(value):
+        value = round(value, CHART_DECIMALS)
+        return int(value) if value.is_integer() else value
+    return value
+
+
+_compact_values = np.frompyfunc(_compact_value, 1, 1)
+
+
+def compact(fig):
+    """
+    ``fig`` with its data trimmed for the browser, in place.
+
+    Numbers are rounded to ``CHART_DECIMALS``, and float columns holding
+    whole numbers become integers, which Plotly packs into the smallest
+    integer type instead of 8-byte floats. Mixed or gappy data (hover
+    ``customdata``) goes out as JSON lists, so there the trailing ".0"s
+    are dropped instead.
+    """
+    for trace in fig.data:
+        for attr in ("x", "y", "values", "text", "customdata"):
+            if attr not in trace or trace[attr] is None:
+                continue
+            values = np.asarray(trace[attr])
+            if values.dtype.kind == "f":
+                values = values.round(CHART_DECIMALS)
+                if np.isfinite(values).all() and (values == np.trunc(values)).all():
+                    trace[attr] = values.astype(np.int64)
+                    continue
+                if values.ndim == 1:
+                    trace[attr] = values
+                    continue
+            elif values.dtype != object:
+                continue
+            # Plotly would turn an object array back into floats; lists are kept as they are
+            trace[attr] = _compact_values(values.astype(object)).tolist()
+    return fig
+
+
+# ============================================
+# FIGURE CACHE
+# ============================================
+
+class FigureCache:
+    """
+    Built figures keyed on (chart name, data version, chart parameters).
+
+    Entries are shared across sessions and must be treated as read-only;
+    ``st.plotly_chart`` only serialises them. Figures are ``compact``-ed
+    when built. The least recently used entry is dropped once
+    ``max_entries`` is exceeded.
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name, version, build, *frames, **params):
+        """
+        Return the cached figure, or ``build(*frames, **params)`` on a miss.
+
+        Only ``params`` and ``version`` go into the key; ``version`` must
+        change whenever ``frames`` do.
+        """
+        key = (name, version, tuple(sorted(params.items())))
+        with self._lock:
+            fig = self._figures.get(key)
+            if fig is not None:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                return fig
+            self.misses += 1
+
+        fig = compact(build(*frames, **params))
+        with self._lock:
+            self._figures[key] = fig
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+        return fig
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._figures),
+                    "hit_rate": self.hits / total if total else 0.0}
@@ -0,0 +1,122 @@
+"""
+Configuration for the Micro-Drama dashboard.
+
+Shared by the Streamlit app (app2.py) and the command-line tools, so the
+sheet URLs and cache locations only live in one place.
+"""
+
+import json
+import os
+
+from exports import DEFAULT_DIR as DEFAULT_EXPORT_DIR
+from history import DEFAULT_PATH as DEFAULT_HISTORY_PATH
+from momentum import ANOMALY_Z, BASELINE, WINDOW
+from perf import DEFAULT_LOG as DEFAULT_METRICS_LOG
+from snapshot_cache import DEFAULT_DIR as DEFAULT_SNAPSHOT_DIR
+
+# ============================================
+# GOOGLE SHEETS CONFIGURATION
+# ============================================
+# 
+# HOW TO SET UP YOUR GOOGLE SHEET:
+# 
+# 1. Create a new Google Sheet
+# 2. Create 4 tabs named exactly:
+#    - "platforms"
+#    - "titles" 
+#    - "genres"
+#    - "regions"
+#
+# 3. For each tab, go to: File > Share > Publish to web
+#    - Select the specific tab
+#    - Choose "Comma-separated values (.csv)"
+#    - Click Publish and copy the URL
+#
+# 4. Paste each URL below (replacing the existing ones)
+#
+# IMPORTANT: Every time you update the sheet, changes appear 
+# in your dashboard within ~5 minutes (Google's cache refresh)
+# ============================================
+
+SHEET_URLS = {
+    "platforms": "https://docs.google.com/spreadsheets/d/e/2PACX-1vT_-4nL7L0B90pPRqkI8rAIXcVr75A7wrg6T28cfZefl-ukGyW2pgqkfv-ZeEcs3SjBPgwnx1L9i5mv/pub?gid=1459790836&single=true&output=csv",  # Paste your platforms tab CSV URL here
+    "titles": "https://docs.google.com/spreadsheets/d/e/2PACX-1vT_-4nL7L0B90pPRqkI8rAIXcVr75A7wrg6T28cfZefl-ukGyW2pgqkfv-ZeEcs3SjBPgwnx1L9i5mv/pub?gid=127623823&single=true&output=csv",     # Paste your titles tab CSV URL here
+    "genres": "https://docs.google.com/spreadsheets/d/e/2PACX-1vT_-4nL7L0B90pPRqkI8rAIXcVr75A7wrg6T28cfZefl-ukGyW2pgqkfv-ZeEcs3SjBPgwnx1L9i5mv/pub?gid=1423857329&single=true&output=csv",     # Paste your genres tab CSV URL here
+    "regions": "https://docs.google.com/spreadsheets/d/e/2PACX-1vT_-4nL7L0B90pPRqkI8rAIXcVr75A7wrg6T28cfZefl-ukGyW2pgqkfv-ZeEcs3SjBPgwnx1L9i5mv/pub?gid=57981399&single=true&output=csv",    # Paste your regions tab CSV URL here
+}
+
+# Point every tab at a local stand-in instead (see sheets_stub.py)
+if os.environ.get("SHEETS_BASE_URL"):
+    SHEET_URLS = {tab: f"{os.environ['SHEETS_BASE_URL'].rstrip('/')}/{tab}.csv" for tab in SHEET_URLS}
+
+# Set to True once you've added your Google Sheet URLs
+USE_GOOGLE_SHEETS = True
+
+# Seconds to wait for each tab before falling back to its default data
+SHEET_TIMEOUT = 10
+
+# After SHEET_BREAKER_FAILURES loads in a row where no sheet answered, stop
+# calling Google for SHEET_BREAKER_RESET seconds (doubling after each failed
+# probe, up to SHEET_BREAKER_MAX) and keep serving the last good data
+SHEET_BREAKER_FAILURES = 3
+SHEET_BREAKER_RESET = 60
+SHEET_BREAKER_MAX = 1800
+
+# Tabs read from a local file or database instead of their Google Sheet,
+# e.g. a vendor's multi-GB titles export:
+#
+#   LOCAL_SOURCES = {
+#       "titles": {"path": "/data/vendor_titles.parquet",
+#                  "filters": [("weeks_trending", ">", 0), ("status", "!=", "Ended")]},
+#       "platforms": {"path": "/data/market.sqlite3", "table": "platforms"},
+#   }
+#
+# .csv / .csv.gz, .parquet (file or directory) and .sqlite / .db paths are
+# read in chunks of "chunk_rows"; only the dashboard's columns and the rows
+# passing every filter (==, !=, <, <=, >, >=, in, not in) are kept. Set
+# "format" if the suffix says otherwise, and "read_options" for extra
+# read_csv arguments such as {"sep": ";"}. Can also be given as JSON in the
+# LOCAL_SOURCES environment variable.
+LOCAL_SOURCES = json.loads(os.environ.get("LOCAL_SOURCES") or "{}")
+
+# Where the last good load is kept between restarts
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", DEFAULT_SNAPSHOT_DIR)
+
+# The static report (report.py) keeps its own: a snapshot cache prunes every
+# version folder but its own, so two processes can't share one directory
+REPORT_SNAPSHOT_DIR = os.environ.get("REPORT_SNAPSHOT_DIR", SNAPSHOT_DIR.rstrip(os.sep) + "-report")
+
+# Bars / slices shown in each chart before the rest is rolled up into
+# "Other" or cut off (adjustable from the sidebar)
+DEFAULT_TOP_N = 10
+
+# Rows sent to the browser per page of a table; longer tables get a page picker
+TABLE_PAGE_ROWS = 500
+
+# Where download payloads are cached once built
+EXPORT_DIR = os.environ.get("EXPORT_DIR", DEFAULT_EXPORT_DIR)
+
+# Seconds between background polls of each tab (shared by all viewers).
+# Rankings change weekly and the market tabs monthly, so poll those less.
+TAB_REFRESH_INTERVALS = {
+    "platforms": 300,
+    "titles": 300,
+    "genres": 1800,
+    "regions": 1800,
+}
+
+# Weekly history of every loaded version; rank changes are computed from it
+# instead of the sheet's rank_last_week column once a prior week exists
+HISTORY_PATH = os.environ.get("HISTORY_PATH", DEFAULT_HISTORY_PATH)
+
+# Momentum is measured over MOMENTUM_WINDOW recorded weeks; a weekly move
+# more than ANOMALY_THRESHOLD standard deviations away from the previous
+# MOMENTUM_BASELINE weeks of moves is flagged as anomalous
+MOMENTUM_WINDOW = WINDOW
+MOMENTUM_BASELINE = BASELINE
+ANOMALY_THRESHOLD = ANOMALY_Z
+
+# One JSON line of per-section timings is appended here for every page run
+# (set METRICS_LOG to an empty string to turn it off). Open the dashboard
+# with ?debug=1 to see the aggregates in the sidebar.
+METRICS_LOG = os.environ.get("METRICS_LOG", DEFAULT_METRICS_LOG)
@@ -0,0 +1,114 @@
+"""
+Pre-aggregated rollups of the titles and platforms tabs.
+
+A ``Cube`` groups a tab once by all of its dimensions and keeps, per cell,
+the row count plus the sum and non-null count of every measure. Any rollup
+over a subset of the dimensions, sliced by any selection of their values,
+is then a groupby over the cells instead of the rows: a few hundred cells
+stand in for however many titles there are. Means are derived from sums and
+counts, so they stay exact at every level of the drill-down.
+
+Dimension names match the filter names in ``filters.FILTERS``, so a sidebar
+selection slices a cube directly. Region isn't a dimension: neither tab has
+one, and the regions tab is itself already a per-region rollup.
+"""
+
+import numpy as np
+import pandas as pd
+
+TITLE_DIMENSIONS = ("platform", "origin", "genre", "sub_genre")
+TITLE_MEASURES = ("episodes", "revenue_est", "views_est")
+
+PLATFORM_DIMENSIONS = ("platform", "origin")
+PLATFORM_MEASURES = ("installs", "revenue_q1_2025", "content_count", "score", "us_share")
+
+
+class Cube:
+    """
+    Cells of one tab grouped by ``dimensions``.
+
+    ``cells`` has one row per observed combination of dimension values,
+    with ``rows`` and, per measure, ``<measure>`` (the sum) and
+    ``<measure>_n`` (how many rows had a value). Cubes are shared across
+    sessions, so treat them as read-only; ``slice`` returns a new one.
+    """
+
+    def __init__(self, cells, dimensions, measures):
+        self.cells = cells
+        self.dimensions = tuple(dimensions)
+        self.measures = tuple(measures)
+
+    @classmethod
+    def build(cls, df, dimensions, measures):
+        """
+        Cube over ``df``. ``dimensions`` maps each dimension name to a
+        Series aligned with ``df`` (usually one of its columns).
+        """
+        measures = [m for m in measures if m in df]
+        # Whole numbers sum as int64 so totals print without a ".0"
+        frame = pd.DataFrame({**{name: values.array for name, values in dimensions.items()},
+                              **{m: df[m].to_numpy("int64" if df[m].dtype.kind in "biu" else "float64")
+                                 for m in measures}})
+        grouped = frame.groupby(list(dimensions), observed=True, dropna=False, sort=False)
+        cells = pd.concat([grouped.size().rename("rows"), grouped.sum(),
+                           grouped.count().add_suffix("_n")], axis=1)
+        return cls(cells.reset_index(), dimensions, measures)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def slice(self, selections):
+        """
+        Cube restricted to the selected values. ``selections`` maps a
+        dimension name to the values to keep; empty selections and names
+        that aren't dimensions of this cube are ignored.
+        """
+        mask = None
+        for name, selected in selections.items():
+            if selected and name in self.dimensions:
+                keep = self.cells[name].isin(list(selected))
+                mask = keep if mask is None else mask & keep
+        if mask is None:
+            return self
+        return Cube(self.cells[mask].reset_index(drop=True), self.dimensions, self.measures)
+
+    def _totals(self):
+        return [c for c in self.cells.columns if c not in self.dimensions]
+
+    def rollup(self, *dimensions):
+        """``cells`` summed up to ``dimensions``, one row per observed combination"""
+        return self.cells.groupby(list(dimensions), observed=True)[self._totals()].sum().reset_index()
+
+    def total(self):
+        """Dict with the grand ``rows`` and each measure's sum and count"""
+        # Column by column, so integer sums aren't widened to float
+        return {c: self.cells[c].sum() for c in self._totals()}
+
+
+def mean(frame, measure):
+    """Mean of ``measure`` from a rollup frame or ``Cube.total`` (NaN where no row had a value)"""
+    counts = frame[f"{measure}_n"]
+    return frame[measure] / np.where(counts > 0, counts, np.nan)
+
+
+def title_origin(df_titles, df_platforms):
+    """Each title's platform origin, via the platforms tab (NaN if the platform isn't listed)"""
+    origins = df_platforms.drop_duplicates("platform").set_index("platform")["origin"]
+    return df_titles["platform"].map(origins).astype(df_platforms["origin"].dtype)
+
+
+def title_cube(df_titles, df_platforms):
+    dimensions = {name: title_origin(df_titles, df_platforms) if name == "origin" else df_titles[name]
+                  for name in TITLE_DIMENSIONS}
+    return Cube.build(df_titles, dimensions, TITLE_MEASURES)
+
+
+def platform_cube(df_platforms):
+    dimensions = {name: df_platforms[name] for name in PLATFORM_DIMENSIONS}
+    return Cube.build(df_platforms, dimensions, PLATFORM_MEASURES)
+
+
+def market_cubes(data):
+    """The cubes the dashboard reads, keyed by tab"""
+    return {"titles": title_cube(data["titles"], data["platforms"]),
+            "platforms": platform_cube(data["platforms"])}
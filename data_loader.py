@@ -0,0 +1,215 @@
+"""
+Data loading for the Micro-Drama dashboard.
+
+Fetches the published Google Sheets tabs concurrently, each with its own
+timeout, and falls back to the bundled default data one tab at a time so a
+single slow or broken tab never takes the others down with it. Requests are
+conditional (ETag / Last-Modified) and unchanged bytes are never re-parsed.
+"""
+
+import functools
+import hashlib
+import io
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import pandas as pd
+
+from breaker import HALF_OPEN
+from schema import apply_schema
+
+TABS = ("platforms", "titles", "genres", "regions")
+
+# Seconds to wait for any single tab before giving up on it
+DEFAULT_TIMEOUT = 10
+
+
+def _default_records():
+    """Rows of every tab of the bundled default data, as plain dicts"""
+
+    platforms_data = [
+        {"platform": "ReelShort", "company": "Crazy Maple Studio", "origin": "China", "score": 4.2, "installs": 50000000, "revenue_2024": 400, "revenue_q1_2025": 180, "rank_current": 1, "rank_last_week": 1, "us_share": 55, "content_count": 500, "monetization": "Coins + Subscription", "threat_level": "Market Leader"},
+        {"platform": "DramaBox", "company": "StoryMatrix (Tencent)", "origin": "Singapore", "score": 4.6, "installs": 100000000, "revenue_2024": 323, "revenue_q1_2025": 145, "rank_current": 2, "rank_last_week": 2, "us_share": 30, "content_count": 400, "monetization": "Coins + Ads", "threat_level": "Strong Challenger"},
+        {"platform": "ShortMax", "company": "Jiuzhou Cultural", "origin": "China", "score": 4.4, "installs": 20000000, "revenue_2024": 85, "revenue_q1_2025": 52, "rank_current": 3, "rank_last_week": 4, "us_share": 8, "content_count": 300, "monetization": "Coins + Subscription", "threat_level": "Rising Fast"},
+        {"platform": "GoodShort", "company": "Nice New", "origin": "China", "score": 4.3, "installs": 10000000, "revenue_2024": 50, "revenue_q1_2025": 28, "rank_current": 4, "rank_last_week": 3, "us_share": 5, "content_count": 250, "monetization": "Coins", "threat_level": "Established"},
+        {"platform": "FlexTV", "company": "Chengdu Yuewen", "origin": "China", "score": 4.1, "installs": 15000000, "revenue_2024": 65, "revenue_q1_2025": 38, "rank_current": 5, "rank_last_week": 5, "us_share": 4, "content_count": 280, "monetization": "Coins + Ads", "threat_level": "Stable"},
+        {"platform": "My Drama", "company": "Holywater / Fox", "origin": "Ukraine", "score": 4.3, "installs": 10000000, "revenue_2024": 40, "revenue_q1_2025": 25, "rank_current": 6, "rank_last_week": 7, "us_share": 3, "content_count": 180, "monetization": "Subscription", "threat_level": "Fox-Backed Growth"},
+        {"platform": "PineDrama", "company": "ByteDance", "origin": "China/TikTok", "score": 4.7, "installs": 2000000, "revenue_2024": 0, "revenue_q1_2025": 5, "rank_current": 7, "rank_last_week": 10, "us_share": 1, "content_count": 50, "monetization": "Free (Ad-supported)", "threat_level": "⚠️ WATCH CLOSELY"},
+        {"platform": "GammaTime", "company": "GammaTime Inc", "origin": "USA", "score": 4.5, "installs": 1000000, "revenue_2024": 0, "revenue_q1_2025": 3, "rank_current": 8, "rank_last_week": 8, "us_share": 1, "content_count": 25, "monetization": "Premium Subscription", "threat_level": "Celebrity-Backed"},
+        {"platform": "Vigloo", "company": "SpoonLabs", "origin": "South Korea", "score": 4.4, "installs": 1000000, "revenue_2024": 15, "revenue_q1_2025": 8, "rank_current": 9, "rank_last_week": 9, "us_share": 1, "content_count": 120, "monetization": "Coins", "threat_level": "K-Content Edge"},
+        {"platform": "MoboReels", "company": "Times Internet", "origin": "India", "score": 4.0, "installs": 5000000, "revenue_2024": 20, "revenue_q1_2025": 12, "rank_current": 10, "rank_last_week": 11, "us_share": 0.5, "content_count": 150, "monetization": "Ads + Coins", "threat_level": "Regional Player"},
+    ]
+
+    titles_data = [
+        {"title": "The Double Life of My Billionaire Husband", "platform": "ReelShort", "genre": "Romance", "sub_genre": "Billionaire", "episodes": 92, "revenue_est": 22, "views_est": "180M", "weeks_trending": 12, "status": "🔥 #1 Overall"},
+        {"title": "Satisfying Justice", "platform": "ReelShort", "genre": "Revenge", "sub_genre": "Family Drama", "episodes": 85, "revenue_est": 18, "views_est": "150M", "weeks_trending": 8, "status": "📈 Rising"},
+        {"title": "Love at First Bite", "platform": "DramaBox", "genre": "Paranormal", "sub_genre": "Vampire Romance", "episodes": 80, "revenue_est": 15, "views_est": "120M", "weeks_trending": 10, "status": "⭐ Steady"},
+        {"title": "Trapped with the CEO", "platform": "ShortMax", "genre": "Romance", "sub_genre": "CEO", "episodes": 78, "revenue_est": 12, "views_est": "95M", "weeks_trending": 6, "status": "📈 Rising"},
+        {"title": "My Secret Mafia Husband", "platform": "My Drama", "genre": "Thriller", "sub_genre": "Mafia Romance", "episodes": 70, "revenue_est": 8, "views_est": "65M", "weeks_trending": 5, "status": "🆕 New Entry"},
+        {"title": "The Alpha's Rejected Mate", "platform": "FlexTV", "genre": "Paranormal", "sub_genre": "Werewolf", "episodes": 88, "revenue_est": 10, "views_est": "80M", "weeks_trending": 7, "status": "⭐ Steady"},
+        {"title": "Revenge of the Discarded Wife", "platform": "DramaBox", "genre": "Revenge", "sub_genre": "Divorce Drama", "episodes": 65, "revenue_est": 9, "views_est": "70M", "weeks_trending": 4, "status": "📈 Rising"},
+        {"title": "Pregnant and Abandoned", "platform": "GoodShort", "genre": "Drama", "sub_genre": "Secret Baby", "episodes": 72, "revenue_est": 7, "views_est": "55M", "weeks_trending": 9, "status": "⭐ Steady"},
+    ]
+
+    genres_data = [
+        {"genre": "Romance", "market_share": 45, "growth_rate": 25, "avg_completion": 78},
+        {"genre": "Revenge", "market_share": 18, "growth_rate": 85, "avg_completion": 82},
+        {"genre": "Paranormal", "market_share": 12, "growth_rate": 45, "avg_completion": 75},
+        {"genre": "Thriller", "market_share": 10, "growth_rate": 60, "avg_completion": 80},
+        {"genre": "Comedy", "market_share": 8, "growth_rate": 30, "avg_completion": 65},
+        {"genre": "Family Drama", "market_share": 7, "growth_rate": 40, "avg_completion": 72},
+    ]
+
+    regions_data = [
+        {"region": "United States", "market_share": 49, "revenue_q1": 343, "growth": 380, "top_platform": "ReelShort"},
+        {"region": "Southeast Asia", "market_share": 18, "revenue_q1": 126, "growth": 450, "top_platform": "DramaBox"},
+        {"region": "Latin America", "market_share": 12, "revenue_q1": 84, "growth": 520, "top_platform": "ReelShort"},
+        {"region": "Europe", "market_share": 10, "revenue_q1": 70, "growth": 280, "top_platform": "DramaBox"},
+        {"region": "Middle East", "market_share": 6, "revenue_q1": 42, "growth": 350, "top_platform": "ShortMax"},
+        {"region": "Other", "market_share": 5, "revenue_q1": 35, "growth": 200, "top_platform": "Various"},
+    ]
+
+    return {
+        "platforms": platforms_data,
+        "titles": titles_data,
+        "genres": genres_data,
+        "regions": regions_data
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def default_frame(tab):
+    """
+    One tab of the bundled default data, typed. Built the first time a tab
+    needs it (a live sheet never does) and then shared, so treat it as
+    read-only.
+    """
+    return apply_schema(tab, pd.DataFrame(_default_records()[tab]))
+
+
+def load_default_data(tabs=TABS):
+    """The bundled default data for ``tabs``"""
+    return {tab: default_frame(tab) for tab in tabs}
+
+
+def fetch_tab(url, timeout=DEFAULT_TIMEOUT, etag=None, last_modified=None):
+    """
+    Download one published tab, conditionally when validators are given.
+
+    Returns ``{"body", "etag", "last_modified"}``; ``body`` is None when the
+    server answered 304 Not Modified.
+    """
+    request = urllib.request.Request(url)
+    if etag:
+        request.add_header("If-None-Match", etag)
+    if last_modified:
+        request.add_header("If-Modified-Since", last_modified)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as resp:
+            return {"body": resp.read(), "etag": resp.headers.get("ETag"),
+                    "last_modified": resp.headers.get("Last-Modified")}
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return {"body": None, "etag": etag, "last_modified": last_modified}
+        raise
+
+
+def fetch_and_parse(tab, url, timeout=DEFAULT_TIMEOUT, previous=None):
+    """
+    Fetch a tab and parse it (typed by ``schema``) only if it changed since
+    ``previous``.
+
+    ``previous`` is ``{"frame", "etag", "last_modified", "raw_hash"}`` from
+    the last successful fetch. Returns ``(frame, validators, changed)``.
+    """
+    previous = previous or {}
+    result = fetch_tab(url, timeout, previous.get("etag"), previous.get("last_modified"))
+    if result["body"] is None:
+        validators = {k: previous.get(k) for k in ("etag", "last_modified", "raw_hash")}
+        return previous["frame"], validators, False
+
+    raw_hash = hashlib.sha256(result["body"]).hexdigest()
+    validators = {"etag": result["etag"], "last_modified": result["last_modified"], "raw_hash": raw_hash}
+    # Google's published CSVs rarely honour conditional requests, so the
+    # byte hash is what actually saves us the parse on an unchanged tab.
+    if previous.get("frame") is not None and raw_hash == previous.get("raw_hash"):
+        return previous["frame"], validators, False
+    return apply_schema(tab, pd.read_csv(io.BytesIO(result["body"]))), validators, True
+
+
+def _fetch_parallel(urls, tabs, timeout, previous, max_workers):
+    """tab -> ``(result, error)`` for each of ``tabs``, fetched concurrently"""
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sheets")
+    futures = {tab: pool.submit(fetch_and_parse, tab, urls[tab], timeout, previous.get(tab)) for tab in tabs}
+    # The socket timeout only bounds each blocking read, so also cap the
+    # overall wait: a server trickling bytes must not hold the page hostage.
+    wait(futures.values(), timeout=timeout)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    results = {}
+    for tab, future in futures.items():
+        if not future.done():
+            results[tab] = (None, f"timed out after {timeout}s")
+        elif future.exception() is not None:
+            results[tab] = (None, str(future.exception()) or type(future.exception()).__name__)
+        else:
+            results[tab] = (future.result(), None)
+    return results
+
+
+def _fetch_guarded(urls, tabs, timeout, previous, max_workers, breaker):
+    """
+    ``_fetch_parallel`` behind ``breaker``: refused outright while the
+    circuit is open, and while half-open one tab probes the endpoint
+    before the rest follow. A load counts as failed when no tab answered.
+    """
+    if not breaker.allow():
+        return {tab: (None, f"skipped: {breaker.describe()}") for tab in tabs}
+    results = {}
+    for batch in (tabs[:1], tabs[1:]) if breaker.state == HALF_OPEN else (tabs,):
+        if not batch:
+            continue
+        if results and not breaker.allow():
+            results.update({tab: (None, f"skipped: {breaker.describe()}") for tab in batch})
+            continue
+        fetched = _fetch_parallel(urls, batch, timeout, previous, max_workers)
+        errors = [error for _, error in fetched.values() if error]
+        breaker.record(len(errors) < len(fetched), errors[0] if errors else None)
+        results.update(fetched)
+    return results
+
+
+def load_sheets(urls, timeout=DEFAULT_TIMEOUT, tabs=TABS, previous=None, max_workers=len(TABS), breaker=None):
+    """
+    Fetch the requested tabs in parallel.
+
+    Returns ``(data, status)``. ``data`` holds every requested tab; any tab
+    that is unconfigured, errors out or misses the deadline is replaced by
+    its default frame. ``status`` maps each tab to ``{"live", "error",
+    "changed", "validators"}`` so the UI can say which tabs are stale and
+    the caller can skip work for tabs whose content did not change.
+    ``previous`` maps tab -> the ``previous`` argument of
+    ``fetch_and_parse``. With a ``breaker`` (``breaker.CircuitBreaker``)
+    the fetches go through it, so an unreachable endpoint fails fast.
+    """
+    previous = previous or {}
+    data, status = {}, {}
+
+    configured = [tab for tab in tabs if urls.get(tab)]
+    if breaker is not None and configured:
+        results = _fetch_guarded(urls, configured, timeout, previous, max_workers, breaker)
+    else:
+        results = _fetch_parallel(urls, configured, timeout, previous, max_workers)
+
+    for tab in tabs:
+        result, error = results.get(tab, (None, "no URL configured"))
+        if result is not None:
+            data[tab], validators, changed = result
+            status[tab] = {"live": True, "error": None, "changed": changed, "validators": validators}
+            continue
+
+        data[tab] = default_frame(tab)
+        status[tab] = {"live": False, "error": error, "changed": True, "validators": None}
+
+    return data, status
@@ -0,0 +1,117 @@
+"""
+Download payloads for the raw-data expander.
+
+Payloads are built only when someone clicks a download button, then kept on
+disk per data version so the next click (from any session) is a file read.
+CSV is written in row chunks, so even the ZIP bundle of a large titles
+table never holds more than one compressed copy in memory.
+"""
+
+import gzip
+import io
+import os
+import shutil
+import time
+import uuid
+import zipfile
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "exports")
+
+# Rows serialised per to_csv call when streaming
+CHUNK_ROWS = 50_000
+
+# Export folders no current version refers to are removed after this long
+KEEP_OLD_SECONDS = 3600
+
+FORMATS = {
+    "csv": {"label": "CSV", "suffix": ".csv", "mime": "text/csv"},
+    "csv.gz": {"label": "CSV (gzip)", "suffix": ".csv.gz", "mime": "application/gzip"},
+    "parquet": {"label": "Parquet", "suffix": ".parquet", "mime": "application/vnd.apache.parquet"},
+}
+BUNDLE = {"label": "ZIP (all tabs)", "suffix": ".zip", "mime": "application/zip"}
+
+
+def write_csv(df, handle, chunk_rows=CHUNK_ROWS):
+    """Write ``df`` as UTF-8 CSV to a binary ``handle`` without building one big string"""
+    text = io.TextIOWrapper(handle, encoding="utf-8", newline="")
+    try:
+        if len(df) == 0:
+            df.to_csv(text, index=False)
+        for start in range(0, len(df), chunk_rows):
+            df.iloc[start:start + chunk_rows].to_csv(text, index=False, header=start == 0)
+        text.flush()
+    finally:
+        text.detach()
+
+
+def write_export(df, fmt, path):
+    if fmt == "csv":
+        with open(path, "wb") as f:
+            write_csv(df, f)
+    elif fmt == "csv.gz":
+        with gzip.open(path, "wb", compresslevel=6) as f:
+            write_csv(df, f)
+    elif fmt == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        raise ValueError(f"unknown export format {fmt!r}")
+
+
+def write_bundle(frames, path):
+    """ZIP of one CSV per tab, each streamed straight into the archive"""
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, df in frames.items():
+            with zf.open(f"{name}.csv", "w", force_zip64=True) as member:
+                write_csv(df, member)
+
+
+class ExportCache:
+    """Builds export files on first request and reuses them per data version"""
+
+    def __init__(self, directory=DEFAULT_DIR):
+        self.directory = directory
+
+    def path(self, version, filename, build, live=()):
+        """
+        Path of ``filename`` for data ``version``, calling ``build(path)`` to
+        create it the first time. Building prunes old folders, but never one
+        of ``version`` or ``live`` (the versions the page currently offers).
+        """
+        folder = os.path.join(self.directory, version)
+        path = os.path.join(folder, filename)
+        if not os.path.exists(path):
+            os.makedirs(folder, exist_ok=True)
+            tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+            try:
+                build(tmp)
+                os.replace(tmp, path)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+            self._prune(keep={version, *live})
+        return path
+
+    def read(self, version, filename, build, live=()):
+        try:
+            with open(self.path(version, filename, build, live), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            # Another process pruned an old version's folder in between
+            with open(self.path(version, filename, build, live), "rb") as f:
+                return f.read()
+
+    def tab(self, version, name, df, fmt, live=()):
+        """Bytes of one tab in ``fmt`` (a key of ``FORMATS``)"""
+        filename = f"{name}{FORMATS[fmt]['suffix']}"
+        return self.read(version, filename, lambda path: write_export(df, fmt, path), live)
+
+    def bundle(self, version, frames, live=()):
+        """Bytes of the ZIP bundle of ``frames`` (name -> DataFrame)"""
+        return self.read(version, f"bundle{BUNDLE['suffix']}", lambda path: write_bundle(frames, path), live)
+
+    def _prune(self, keep):
+        cutoff = time.time() - KEEP_OLD_SECONDS
+        for name in os.listdir(self.directory):
+            folder = os.path.join(self.directory, name)
+            if name not in keep and os.path.isdir(folder) and os.path.getmtime(folder) < cutoff:
+                shutil.rmtree(folder, ignore_errors=True)
@@ -0,0 +1,202 @@
+"""
+Sidebar filters backed by precomputed indexes.
+
+``FilterIndex`` is built once per data version. Filter columns are already
+categoricals, so a selection becomes a boolean lookup table over the
+category codes and the row mask is a single gather (``lookup[codes]``) with
+no string comparisons. Title search goes through an inverted token index
+over ``title`` and ``sub_genre``: the vocabulary is sorted and postings are
+stored back to back in vocabulary order, so every token starting with a
+typed prefix is one contiguous slice. Changing a filter therefore costs a
+few mask operations, never a rescan of the text.
+
+The filtered frames themselves are kept per selection, so every session
+looking at the same filter reads the same frames instead of its own copy.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Filter name -> the (tab, column) pairs it restricts
+FILTERS = {
+    "platform": [("platforms", "platform"), ("titles", "platform")],
+    "origin": [("platforms", "origin")],
+    "genre": [("titles", "genre"), ("genres", "genre")],
+    "sub_genre": [("titles", "sub_genre")],
+    "region": [("regions", "region")],
+}
+
+# Filter -> {tab: other tab} where the filter reaches ``tab`` through the other
+# tab's rows, so the filtered rows depend on that tab's content too
+CASCADES = {
+    "origin": {"titles": "platforms"},
+}
+
+# Titles columns covered by the free-text search
+SEARCH_COLUMNS = ("title", "sub_genre")
+
+TOKEN = r"\w+"
+
+# Filtered views kept per index; each holds at most a copy of the data
+VIEW_CACHE_SIZE = 16
+
+
+def tokenize(text):
+    return pd.Series([text]).str.lower().str.findall(TOKEN).iloc[0]
+
+
+class _Codes:
+    """Category codes of one column, for building masks from selections"""
+
+    def __init__(self, series):
+        values = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype("category")
+        self.categories = values.cat.categories
+        # -1 (missing) indexes the extra False slot at the end of each lookup
+        self.codes = values.cat.codes.to_numpy()
+
+    def mask(self, selected):
+        lookup = np.zeros(len(self.categories) + 1, dtype=bool)
+        positions = self.categories.get_indexer(list(selected))
+        lookup[positions[positions >= 0]] = True
+        return lookup[self.codes]
+
+
+class _TokenIndex:
+    """Inverted index: lower-cased token -> row positions"""
+
+    def __init__(self, df, columns):
+        text = df[columns[0]].astype("string").fillna("").reset_index(drop=True)
+        for column in columns[1:]:
+            text = text + " " + df[column].astype("string").fillna("").to_numpy()
+        # After explode the index is each token's row position
+        tokens = text.str.lower().str.findall(TOKEN).explode().dropna()
+        codes, vocab = pd.factorize(tokens, sort=True)
+        rows = tokens.index.to_numpy(dtype=np.int64)
+        order = np.argsort(codes, kind="stable")
+        self.rows = len(df)
+        self.vocab = np.asarray(vocab, dtype=str)
+        self.postings = rows[order]
+        self.offsets = np.searchsorted(codes[order], np.arange(len(vocab) + 1))
+
+    def mask(self, query):
+        """Rows containing a token starting with each word of ``query``"""
+        mask = np.ones(self.rows, dtype=bool)
+        for word in tokenize(query):
+            lo, hi = np.searchsorted(self.vocab, [word, word + "\uffff"])
+            hits = np.zeros(self.rows, dtype=bool)
+            hits[self.postings[self.offsets[lo]:self.offsets[hi]]] = True
+            mask &= hits
+        return mask
+
+
+class FilterIndex:
+    """
+    Masks for every filter over the frames of one data version.
+
+    The frames are only read while building; ``apply`` takes the same frames
+    again so the index itself holds codes, postings and the last
+    ``max_views`` filtered views.
+    """
+
+    def __init__(self, data, max_views=VIEW_CACHE_SIZE):
+        self.columns = {(tab, column): _Codes(data[tab][column])
+                        for pairs in FILTERS.values() for tab, column in pairs if column in data[tab]}
+        self._options = {}
+        self.max_views = max_views
+        self._views = OrderedDict()
+        self._lock = threading.Lock()
+        self.search = _TokenIndex(data["titles"], [c for c in SEARCH_COLUMNS if c in data["titles"]])
+        # Each titles.platform category's position among platforms.platform
+        # categories (-1 if the platform isn't in the platforms tab)
+        self._title_platforms = self.columns[("platforms", "platform")].categories.get_indexer(
+            self.columns[("titles", "platform")].categories)
+
+    def options(self, name):
+        """Every value of filter ``name`` across the tabs it covers, sorted"""
+        if name not in self._options:
+            values = set()
+            for tab, column in FILTERS[name]:
+                if (tab, column) in self.columns:
+                    values.update(self.columns[(tab, column)].categories)
+            self._options[name] = sorted(values, key=str)
+        return self._options[name]
+
+    def masks(self, data, selections, search=""):
+        """
+        Row mask per tab (None when nothing restricts that tab).
+
+        Origin choices cascade to the titles tab through each title's
+        platform (platform choices apply to both tabs directly).
+        """
+        masks = {tab: None for tab in data}
+
+        def restrict(tab, mask):
+            masks[tab] = mask if masks[tab] is None else masks[tab] & mask
+
+        for name, selected in selections.items():
+            if not selected:
+                continue
+            for tab, column in FILTERS[name]:
+                if (tab, column) in self.columns:
+                    restrict(tab, self.columns[(tab, column)].mask(selected))
+
+        if selections.get("origin") and masks["platforms"] is not None:
+            platforms = self.columns[("platforms", "platform")]
+            allowed = np.zeros(len(platforms.categories) + 1, dtype=bool)
+            allowed[platforms.codes[masks["platforms"]]] = True
+            # Titles whose platform survived go through the same code lookup
+            lookup = np.r_[allowed[self._title_platforms], False]
+            restrict("titles", lookup[self.columns[("titles", "platform")].codes])
+        if search.strip():
+            restrict("titles", self.search.mask(search))
+        return masks
+
+    def apply(self, data, selections, search=""):
+        """
+        ``(frames, keys)``: the filtered frames, and per tab a short key of
+        the filter that produced it (None for tabs left untouched, which are
+        returned as the original frame objects).
+
+        The same selection returns the same frames for as long as the view
+        is cached, so they are shared and must be treated as read-only.
+        """
+        signature = json.dumps({"selections": {k: sorted(map(str, v)) for k, v in selections.items() if v},
+                                "search": search.strip().lower()}, sort_keys=True)
+        with self._lock:
+            view = self._views.get(signature)
+            if view is not None:
+                self._views.move_to_end(signature)
+                return view
+
+        frames, keys = {}, {}
+        for tab, mask in self.masks(data, selections, search).items():
+            if mask is None or mask.all():
+                frames[tab], keys[tab] = data[tab], None
+            else:
+                frames[tab] = data[tab][mask]
+                keys[tab] = hashlib.sha256(signature.encode()).hexdigest()[:12]
+        with self._lock:
+            self._views[signature] = frames, keys
+            while len(self._views) > self.max_views:
+                self._views.popitem(last=False)
+        return frames, keys
+
+
+def view_hashes(hashes, keys, selections=None):
+    """
+    Per-tab hashes for the filtered frames, for keying derived data. A tab
+    filtered through another (see ``CASCADES``) also takes that tab's hash.
+    """
+    depends = {tab: [tab] for tab in hashes}
+    for name, selected in (selections or {}).items():
+        if selected:
+            for tab, other in CASCADES.get(name, {}).items():
+                depends[tab].append(other)
+    return {tab: hashes[tab] if not keys.get(tab) else hashlib.sha256(
+                ":".join([*(hashes[t] for t in depends[tab]), keys[tab]]).encode()).hexdigest()
+            for tab in hashes}
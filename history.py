@@ -0,0 +1,227 @@
+"""
+Weekly history of the platforms, titles and genres tabs, in a local SQLite file.
+
+Every published data version is recorded against the week (Monday) it was
+loaded in; a later version in the same week replaces that week's rows, so
+each platform and title has at most one point per week. Rows are keyed on
+``(platform, week)`` / ``(title, week)`` in WITHOUT ROWID tables, which
+keeps one entity's series physically together: "rank of X over the last 52
+weeks" is a single index range scan however many apps and years are stored.
+A second index on ``week`` serves "every platform in week W".
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "history.sqlite3")
+
+# Sheet column -> history column, per recorded tab
+PLATFORM_COLUMNS = {
+    "rank_current": "rank",
+    "installs": "installs",
+    "revenue_q1_2025": "revenue",
+    "score": "score",
+    "us_share": "us_share",
+    "content_count": "content_count",
+}
+GENRE_COLUMNS = {
+    "market_share": "market_share",
+    "growth_rate": "growth_rate",
+    "avg_completion": "avg_completion",
+}
+TITLE_COLUMNS = {
+    "platform": "platform",
+    "revenue_est": "revenue",
+    "views_est": "views",
+    "weeks_trending": "weeks_trending",
+}
+
+# Recorded tab -> its table
+TABLES = {
+    "platforms": "platform_weeks",
+    "titles": "title_weeks",
+    "genres": "genre_weeks",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    version TEXT PRIMARY KEY,
+    week TEXT NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS platform_weeks (
+    platform TEXT NOT NULL,
+    week TEXT NOT NULL,
+    rank INTEGER,
+    installs INTEGER,
+    revenue REAL,
+    score REAL,
+    us_share REAL,
+    content_count INTEGER,
+    version TEXT NOT NULL,
+    PRIMARY KEY (platform, week)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS platform_weeks_by_week ON platform_weeks (week);
+CREATE TABLE IF NOT EXISTS title_weeks (
+    title TEXT NOT NULL,
+    week TEXT NOT NULL,
+    platform TEXT,
+    revenue REAL,
+    views REAL,
+    weeks_trending INTEGER,
+    version TEXT NOT NULL,
+    PRIMARY KEY (title, week)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS title_weeks_by_week ON title_weeks (week);
+CREATE TABLE IF NOT EXISTS genre_weeks (
+    genre TEXT NOT NULL,
+    week TEXT NOT NULL,
+    market_share REAL,
+    growth_rate REAL,
+    avg_completion REAL,
+    version TEXT NOT NULL,
+    PRIMARY KEY (genre, week)
+) WITHOUT ROWID;
+"""
+
+
+def week_of(timestamp):
+    """ISO date of the Monday starting the week that ``timestamp`` falls in"""
+    day = datetime.fromtimestamp(timestamp).date()
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+
+def _rows(df, key, columns, week, version):
+    """Parameter tuples for executemany, with NaN / NA turned into NULL"""
+    frame = pd.DataFrame({key: df[key].astype(str)})
+    for source, target in columns.items():
+        values = df[source]
+        if target == "platform":
+            frame[target] = values.astype(str)
+        elif values.dtype == np.float32:
+            # Widen via 7 significant digits so 4.2 is stored as 4.2, not 4.199999809
+            frame[target] = np.round(values.astype("float64"), 6)
+        else:
+            frame[target] = values.astype("float64")
+    frame = frame.astype(object).where(frame.notna(), None)
+    frame.insert(1, "week", week)
+    frame["version"] = version
+    return frame.itertuples(index=False, name=None)
+
+
+class HistoryStore:
+    """
+    Appends data versions to the SQLite file at ``path`` and answers
+    per-entity and per-week queries.
+
+    One connection is shared by the refresher thread and page runs, guarded
+    by a lock; WAL mode lets other processes read while one writes.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ---- writes -----------------------------------------------------------
+
+    def record(self, snapshot, tabs=("platforms", "titles", "genres")):
+        """
+        Record ``tabs`` of a published snapshot (``SnapshotCache.current``)
+        under the week of its ``saved_at``. Recording the same version twice
+        is a no-op.
+        """
+        week = week_of(snapshot["saved_at"])
+        data = snapshot["data"]
+        with self._lock, self._conn:
+            seen = self._conn.execute("SELECT 1 FROM versions WHERE version = ?", (snapshot["version"],)).fetchone()
+            if seen:
+                return False
+            self._conn.execute("INSERT INTO versions VALUES (?, ?, ?)",
+                               (snapshot["version"], week, snapshot["saved_at"]))
+            if "platforms" in tabs:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO platform_weeks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    _rows(data["platforms"], "platform", PLATFORM_COLUMNS, week, snapshot["version"]))
+            if "titles" in tabs:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO title_weeks VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    _rows(data["titles"], "title", TITLE_COLUMNS, week, snapshot["version"]))
+            if "genres" in tabs:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO genre_weeks VALUES (?, ?, ?, ?, ?, ?)",
+                    _rows(data["genres"], "genre", GENRE_COLUMNS, week, snapshot["version"]))
+        return True
+
+    # ---- reads ------------------------------------------------------------
+
+    def _frame(self, sql, params):
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            columns = [c[0] for c in cursor.description]
+            return pd.DataFrame(cursor.fetchall(), columns=columns)
+
+    def recorded_week(self, tab):
+        """
+        The latest week ``tab`` was recorded in, i.e. the week of the data
+        the refresher last published for it, or None
+        """
+        with self._lock:
+            row = self._conn.execute(f"SELECT MAX(week) FROM {TABLES[tab]}").fetchone()
+        return row[0]
+
+    def previous_week(self, week):
+        """The latest recorded week before ``week``, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(week) FROM platform_weeks WHERE week < ?", (week,)).fetchone()
+        return row[0]
+
+    def previous_ranks(self, week):
+        """Series platform -> rank in the latest recorded week before ``week``"""
+        previous = self.previous_week(week)
+        if previous is None:
+            return pd.Series(dtype="float64")
+        ranks = self._frame("SELECT platform, rank FROM platform_weeks WHERE week = ?", (previous,))
+        return ranks.set_index("platform")["rank"].astype("float64")
+
+    def platform_series(self, platform, weeks=52, until=None):
+        """One platform's weekly points over the ``weeks`` weeks up to ``until`` (default: now)"""
+        start, end = self._range(weeks, until)
+        return self._frame("SELECT * FROM platform_weeks WHERE platform = ? AND week BETWEEN ? AND ? ORDER BY week",
+                           (platform, start, end))
+
+    def title_series(self, title, weeks=52, until=None):
+        start, end = self._range(weeks, until)
+        return self._frame("SELECT * FROM title_weeks WHERE title = ? AND week BETWEEN ? AND ? ORDER BY week",
+                           (title, start, end))
+
+    def platform_weeks(self, weeks=52, until=None):
+        """Every platform's weekly points over a window, ordered by platform then week"""
+        start, end = self._range(weeks, until)
+        return self._frame("SELECT * FROM platform_weeks WHERE week BETWEEN ? AND ? ORDER BY platform, week",
+                           (start, end))
+
+    def genre_weeks(self, weeks=52, until=None):
+        """Every genre's weekly points over a window, ordered by genre then week"""
+        start, end = self._range(weeks, until)
+        return self._frame("SELECT * FROM genre_weeks WHERE week BETWEEN ? AND ? ORDER BY genre, week",
+                           (start, end))
+
+    @staticmethod
+    def _range(weeks, until):
+        end = date.fromisoformat(until or week_of(time.time()))
+        return (end - timedelta(weeks=weeks - 1)).isoformat(), end.isoformat()
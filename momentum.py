@@ -0,0 +1,197 @@
+"""
+Momentum and anomaly scores from the weekly history.
+
+Works on the long frames returned by ``HistoryStore.platform_weeks`` and
+``genre_weeks`` (one row per entity and week, sorted by entity then week).
+Every window statistic is computed for all rows at once from prefix sums
+over the group boundaries, so the cost is a few NumPy passes whatever the
+number of apps or weeks; there is no per-group Python loop. Windows count
+recorded weeks, so a week with no load is skipped rather than treated as
+a zero.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Weeks a trend is measured over, and weeks of weekly moves an anomaly is
+# judged against
+WINDOW = 4
+BASELINE = 12
+
+# A weekly move this many standard deviations from the entity's own recent
+# moves is flagged
+ANOMALY_Z = 3.0
+
+# Places per week (averaged over the window) that count as rising or slipping
+RISING_VELOCITY = 1.0
+
+# Fewest earlier weekly moves needed before a move can be called anomalous
+MIN_BASELINE = 4
+
+# Sheet labels that only describe momentum, so a computed one replaces them
+MANUAL_MOMENTUM_LABELS = ("rising fast", "watch closely")
+
+# Change kinds: how "now" compares with "then"
+#   rank   places gained per week (a lower rank number is better)
+#   pct    relative change
+#   diff   absolute change (e.g. share points)
+PLATFORM_MEASURES = {
+    "rank_velocity": ("rank", "rank"),
+    "revenue_growth": ("revenue", "pct"),
+    "share_change": ("us_share", "diff"),
+}
+GENRE_MEASURES = {
+    "share_change": ("market_share", "diff"),
+    "growth_change": ("growth_rate", "diff"),
+}
+
+
+def _positions(keys):
+    """Group number and position within the group for each row of sorted ``keys``"""
+    starts = np.r_[True, keys[1:] != keys[:-1]]
+    group = np.cumsum(starts) - 1
+    return group, np.arange(len(keys)) - np.flatnonzero(starts)[group]
+
+
+def _shift(values, pos, n):
+    """Value ``n`` rows earlier in the same group (NaN before the group has n rows)"""
+    out = np.full(len(values), np.nan)
+    out[n:] = values[:len(values) - n]
+    out[pos < n] = np.nan
+    return out
+
+
+def _change(now, then, kind, window):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if kind == "rank":
+            return (then - now) / window
+        if kind == "pct":
+            return np.where(then > 0, now / then - 1, np.nan)
+        return now - then
+
+
+def _trailing_stats(values, pos, n):
+    """
+    Mean, standard deviation and count of the up to ``n`` non-NaN values
+    before each row in its group (the row itself excluded).
+    """
+    valid = ~np.isnan(values)
+    x = np.where(valid, values, 0.0)
+    sums = np.r_[0.0, np.cumsum(x)]
+    squares = np.r_[0.0, np.cumsum(x * x)]
+    counts = np.r_[0, np.cumsum(valid)]
+    end = np.arange(len(values))
+    start = end - np.minimum(pos, n)
+    count = counts[end] - counts[start]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = (sums[end] - sums[start]) / count
+        var = (squares[end] - squares[start] - count * mean * mean) / (count - 1)
+    return mean, np.sqrt(np.clip(var, 0, None)), count
+
+
+def momentum(history, key, measures, window=WINDOW, baseline=BASELINE, threshold=ANOMALY_Z):
+    """
+    Latest momentum per entity: one row per ``key`` value with its last
+    week, the number of recorded weeks, each measure's change over
+    ``window`` weeks, the z-score of its latest weekly move against the
+    ``baseline`` weeks before it, and ``anomaly`` when any |z| reaches
+    ``threshold``.
+    """
+    if history.empty:
+        columns = [key, "week", "weeks", *measures, *(f"{name}_z" for name in measures), "anomaly"]
+        return pd.DataFrame(columns=columns)
+
+    history = history.sort_values([key, "week"], kind="stable")
+    keys = history[key].to_numpy()
+    _, pos = _positions(keys)
+    last = np.r_[keys[1:] != keys[:-1], True]
+
+    out = {key: keys[last], "week": history["week"].to_numpy()[last], "weeks": pos[last] + 1}
+    anomaly = np.zeros(last.sum(), dtype=bool)
+    for name, (column, kind) in measures.items():
+        values = history[column].to_numpy(dtype="float64")
+        out[name] = _change(values, _shift(values, pos, window), kind, window)[last]
+        weekly = _change(values, _shift(values, pos, 1), kind, 1)
+        mean, std, count = _trailing_stats(weekly, pos, baseline)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = np.where((count >= MIN_BASELINE) & (std > 0), (weekly - mean) / std, np.nan)
+        out[f"{name}_z"] = z[last]
+        anomaly |= np.abs(z[last]) >= threshold
+    out["anomaly"] = anomaly
+    return pd.DataFrame(out)
+
+
+def platform_momentum(history, window=WINDOW, baseline=BASELINE, threshold=ANOMALY_Z):
+    return momentum(history, "platform", PLATFORM_MEASURES, window, baseline, threshold)
+
+
+def genre_momentum(history, window=WINDOW, baseline=BASELINE, threshold=ANOMALY_Z):
+    return momentum(history, "genre", GENRE_MEASURES, window, baseline, threshold)
+
+
+def momentum_labels(platforms):
+    """Computed status per row of ``platform_momentum`` (None when unremarkable)"""
+    velocity = platforms["rank_velocity"].to_numpy(dtype="float64")
+    labels = np.select(
+        [platforms["anomaly"].to_numpy(dtype=bool), velocity >= RISING_VELOCITY, velocity <= -RISING_VELOCITY],
+        ["⚠️ Watch Closely", "🚀 Rising Fast", "📉 Slipping"],
+        default="",
+    )
+    return pd.Series(labels, index=platforms["platform"]).replace("", None)
+
+
+def status_column(df_platforms, platforms, window=WINDOW):
+    """
+    ``threat_level`` with the computed momentum labels applied.
+
+    Platforms with a computed label get it; platforms with enough history
+    but nothing remarkable lose a hand-typed "Rising Fast" / "Watch
+    Closely" (shown as "Steady"); everything else keeps the sheet's label.
+    """
+    status = df_platforms["threat_level"].astype("string")
+    if platforms is None or platforms.empty:
+        return status
+    tracked = platforms[platforms["weeks"] > window]
+    labels = df_platforms["platform"].map(momentum_labels(tracked)).astype("string")
+    manual = status.str.lower().str.contains("|".join(MANUAL_MOMENTUM_LABELS), na=False)
+    has_history = df_platforms["platform"].isin(tracked["platform"]).to_numpy()
+    status = status.mask(manual & has_history, "Steady")
+    return labels.fillna(status)
+
+
+def genre_insight(df_genres, genres=None, window=WINDOW):
+    """Key Insight text for the Genre Analysis section"""
+    if df_genres.empty:
+        return "No genres match the current filters."
+    # Unparseable sheet cells are NaN, and a filter may select only those
+    growing = df_genres.dropna(subset=["growth_rate"])
+    completing = df_genres.dropna(subset=["avg_completion"])
+    fastest = growing.loc[growing["growth_rate"].idxmax()] if not growing.empty else None
+    best_completion = completing.loc[completing["avg_completion"].idxmax()] if not completing.empty else None
+    if fastest is None and best_completion is None:
+        text = "No growth or completion figures for the selected genres."
+    elif fastest is None:
+        text = (f"**{best_completion['genre']}** has the highest completion rate "
+                f"({float(best_completion['avg_completion']):.0f}%).")
+    else:
+        text = (f"**{fastest['genre']}** is the fastest-growing genre (+{float(fastest['growth_rate']):.0f}% YoY)")
+        if best_completion is None:
+            text += "."
+        elif fastest["genre"] == best_completion["genre"]:
+            text += f" with the highest completion rate ({float(fastest['avg_completion']):.0f}%)."
+        else:
+            text += (f"; **{best_completion['genre']}** has the highest completion rate "
+                     f"({float(best_completion['avg_completion']):.0f}%).")
+    if genres is not None:
+        genres = genres[genres["genre"].isin(df_genres["genre"])]
+    if genres is not None and not genres.empty:
+        movers = genres.dropna(subset=["share_change"])
+        if not movers.empty:
+            gainer = movers.loc[movers["share_change"].idxmax()]
+            if gainer["share_change"] > 0:
+                text += (f" Biggest share gain over the last {window} weeks: **{gainer['genre']}** "
+                         f"(+{gainer['share_change']:.1f} pts).")
+        flagged = genres.loc[genres["anomaly"], "genre"].tolist()
+        if flagged:
+            text += f" Unusual moves this week: {', '.join(flagged)}."
+    return text
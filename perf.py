@@ -0,0 +1,178 @@
+"""
+Lightweight per-section timing for the dashboard.
+
+Each script run gets a ``RunTimer``; the app calls ``timer.start(...)`` at
+the top of every page section and passes its figures through
+``timer.figure`` and its tables through ``timer.table``. Figures are shared
+and measured once each; table pages are new frames every run, so they are
+only serialised for measuring when the timer is asked to. At the end of the
+run the timings go to the process-wide ``PerfStats``, which keeps a rolling
+window for the debug panel and appends one JSON line per run to the
+metrics log.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "metrics.jsonl")
+
+# The log is rotated to <name>.1 once it grows past this
+MAX_LOG_BYTES = 10 * 1024 * 1024
+
+# Figures and tables are shared across runs by the caches, so their
+# serialised size is measured once per object
+_payload_sizes = {}
+_payload_lock = threading.Lock()
+
+
+def _measured(obj, measure):
+    key = id(obj)
+    with _payload_lock:
+        if key in _payload_sizes:
+            return _payload_sizes[key]
+    size = measure(obj)
+    with _payload_lock:
+        _payload_sizes[key] = size
+    weakref.finalize(obj, _payload_sizes.pop, key, None)
+    return size
+
+
+def _figure_bytes(fig):
+    return len(fig.to_json().encode("utf-8"))
+
+
+def _table_bytes(df):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.tell()
+
+
+def payload_size(fig):
+    """Bytes of the figure's JSON, roughly what is sent to the browser"""
+    return _measured(fig, _figure_bytes)
+
+
+def table_payload_size(df):
+    """Bytes of the frame as an Arrow stream, which is how ``st.dataframe`` sends it"""
+    return _measured(df, _table_bytes)
+
+
+class RunTimer:
+    """
+    Wall time, rows processed and figure payload per section of one run,
+    plus table payload with ``measure_tables``
+    """
+
+    def __init__(self, measure_tables=False):
+        self.measure_tables = measure_tables
+        self.started = time.perf_counter()
+        self.sections = {}
+        self._current = None
+        self._since = None
+
+    def start(self, name, rows=0):
+        """
+        End the running section (if any) and start timing ``name``.
+
+        The page is one top-to-bottom script, so sections simply follow each
+        other; a name used twice in a run accumulates.
+        """
+        self.stop()
+        entry = self.sections.setdefault(name, {"ms": 0.0, "rows": 0, "payload_bytes": 0})
+        entry["rows"] += rows
+        self._current, self._since = entry, time.perf_counter()
+
+    def count(self, rows):
+        """Add ``rows`` to the running section, for when they're only known later"""
+        if self._current is not None:
+            self._current["rows"] += rows
+
+    def stop(self):
+        if self._current is not None:
+            self._current["ms"] += (time.perf_counter() - self._since) * 1000
+            self._current = None
+
+    def figure(self, fig):
+        """Count ``fig`` towards the current section's payload and return it"""
+        if self._current is not None:
+            self._current["payload_bytes"] += payload_size(fig)
+        return fig
+
+    def table(self, df):
+        """Count ``df`` towards the current section's payload and return it"""
+        if self._current is not None and self.measure_tables:
+            self._current["payload_bytes"] += table_payload_size(df)
+        return df
+
+    def total_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+
+class PerfStats:
+    """
+    Rolling per-section timings across runs of every session.
+
+    The last ``window`` runs are kept in memory for ``summary``; each run is
+    also appended to ``log_path`` (if set) as one JSON line.
+    """
+
+    def __init__(self, log_path=None, window=200):
+        self.log_path = log_path
+        self.window = window
+        self.runs = 0
+        self._sections = {}
+        self._totals = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, timer, **extra):
+        timer.stop()
+        total_ms = timer.total_ms()
+        with self._lock:
+            self.runs += 1
+            self._totals.append({"ms": total_ms, "rows": None, "payload_bytes": sum(
+                entry["payload_bytes"] for entry in timer.sections.values())})
+            for name, entry in timer.sections.items():
+                self._sections.setdefault(name, deque(maxlen=self.window)).append(dict(entry))
+        if self.log_path:
+            line = {"ts": time.time(), "total_ms": round(total_ms, 2), **extra,
+                    "sections": {name: {**entry, "ms": round(entry["ms"], 2)}
+                                 for name, entry in timer.sections.items()}}
+            self._append(json.dumps(line))
+
+    def summary(self):
+        """One dict per section: runs, mean / p95 / max ms, last rows and payload"""
+        with self._lock:
+            sections = {name: list(entries) for name, entries in self._sections.items()}
+            totals = list(self._totals)
+        rows = []
+        for name, entries in [*sections.items(), ("Total", totals)]:
+            if not entries:
+                continue
+            ms = sorted(e["ms"] for e in entries)
+            last = entries[-1]
+            rows.append({"section": name, "runs": len(ms), "mean_ms": sum(ms) / len(ms),
+                         "p95_ms": ms[min(len(ms) - 1, int(len(ms) * 0.95))], "max_ms": ms[-1],
+                         "rows": last["rows"], "payload_kb": last["payload_bytes"] / 1024})
+        return rows
+
+    def _append(self, line):
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+            with self._lock:
+                if os.path.exists(self.log_path) and os.path.getsize(self.log_path) > MAX_LOG_BYTES:
+                    os.replace(self.log_path, f"{self.log_path}.1")
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+        except OSError:
+            logger.exception("Could not append to metrics log %s", self.log_path)
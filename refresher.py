@@ -0,0 +1,152 @@
+"""
+Process-wide background refresher.
+
+One daemon thread polls each sheet tab on its own jittered schedule and
+publishes each new data version through the snapshot cache. Page runs only
+read ``cache.current``; they never fetch, so no viewer pays for an expiry.
+"""
+
+import functools
+import logging
+import random
+import threading
+import time
+
+from data_loader import TABS
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundRefresher:
+    """
+    Calls ``cache.refresh(fetch, tabs)`` for whichever tabs are due.
+
+    Each tab is polled every ``intervals[tab]`` seconds (``interval`` when
+    not listed), spread by +/- ``jitter`` (a fraction) so several processes
+    don't hit Google in lockstep. After a tab fails the next attempt comes
+    after ``retry_base`` seconds, doubling per consecutive failure up to
+    ``max_backoff``. ``on_publish(snapshot, changed_tabs, live_tabs)`` is
+    called with every new data version just before it becomes
+    ``cache.current``, so no page run sees a version the hook hasn't handled
+    yet; ``live_tabs`` are the tabs read from their source in this refresh
+    (the others are kept from earlier refreshes or fell back).
+    """
+
+    def __init__(self, cache, fetch, interval=300, intervals=None, jitter=0.1, retry_base=30, max_backoff=1800,
+                 on_publish=None):
+        self.cache = cache
+        self.fetch = fetch
+        self.on_publish = on_publish
+        self.interval = interval
+        self.intervals = dict(intervals or {})
+        self.jitter = jitter
+        self.retry_base = retry_base
+        self.max_backoff = max_backoff
+
+        self.runs = 0
+        self.failures = 0
+        self.tab_failures = {tab: 0 for tab in TABS}
+        self.last_error = None
+        self.last_changed = []
+        self.last_run_at = None
+        self.last_duration = None
+        self.next_run_at = None
+        self.due_at = {}
+
+        self._running = False
+        self._forced = True
+        self._thread = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._cond = threading.Condition()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="sheets-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def trigger(self, wait=None):
+        """
+        Refresh every tab now instead of at their scheduled slots.
+
+        With ``wait`` (seconds), block until that refresh has finished or the
+        time is up. Returns True if it finished.
+        """
+        with self._cond:
+            # A run already in flight may have read the sheets before the
+            # trigger, so only the one after it counts.
+            target = self.runs + (2 if self._running else 1)
+            self._forced = True
+        self._wake.set()
+        if not wait:
+            return False
+        with self._cond:
+            return self._cond.wait_for(lambda: self.runs >= target, timeout=wait)
+
+    def wait_until_ready(self, timeout):
+        """Block until the cache has a data version (or ``timeout`` passes)"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.cache.current is not None or self.runs > 0,
+                                       timeout=timeout)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            now = time.time()
+            with self._cond:
+                forced, self._forced = self._forced, False
+            due = [tab for tab in TABS if forced or self.due_at.get(tab, 0) <= now]
+            if due:
+                failed = self._run_once(due)
+                for tab in due:
+                    self.due_at[tab] = time.time() + self._next_delay(tab, tab not in failed)
+            self.next_run_at = min(self.due_at.values())
+            self._wake.wait(max(0, self.next_run_at - time.time()))
+
+    def _run_once(self, tabs):
+        with self._cond:
+            self._running = True
+        changed, error = [], None
+        started = time.time()
+        try:
+            changed = self.cache.refresh(self.fetch, tabs, before_publish=functools.partial(self._publish, tabs))
+            failed = [tab for tab in tabs if self.cache.status[tab]["error"]]
+            if failed:
+                error = self.cache.status[failed[0]]["error"]
+        except Exception as e:
+            logger.exception("Sheet refresh failed")
+            failed, error = list(tabs), str(e) or type(e).__name__
+
+        with self._cond:
+            for tab in tabs:
+                self.tab_failures[tab] = self.tab_failures[tab] + 1 if tab in failed else 0
+            self.failures = max(self.tab_failures.values())
+            self.runs += 1
+            self.last_error = error
+            self.last_changed = changed
+            self.last_run_at = time.time()
+            self.last_duration = self.last_run_at - started
+            self._running = False
+            self._cond.notify_all()
+        return failed
+
+    def _publish(self, tabs, snapshot, changed, status):
+        if self.on_publish is None:
+            return
+        try:
+            self.on_publish(snapshot, changed, [tab for tab in tabs if status[tab]["live"]])
+        except Exception:
+            # Still publish: the new data matters more than its history
+            logger.exception("Publish hook failed")
+
+    def _next_delay(self, tab, ok):
+        if ok:
+            delay = self.intervals.get(tab, self.interval)
+        else:
+            delay = min(self.retry_base * 2 ** (self.tab_failures[tab] - 1), self.max_backoff)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
@@ -0,0 +1,325 @@
+"""
+Static HTML report of the dashboard.
+
+Renders the KPIs, rankings, charts, regional breakdown and raw tables into
+one self-contained HTML file (plotly.js is inlined, nothing is fetched when
+the page is opened), using the same data loading and chart code as the
+Streamlit app. Rank changes and status come from the same weekly history
+store as the app's. The file is only rewritten when the data version
+changes, so it can be served from disk to any number of read-only viewers.
+
+USAGE:
+    python report.py --out report.html
+    python report.py --out /var/www/dashboard/index.html --watch --interval 300
+    python report.py --default-data --out demo.html
+
+Author: Vinitha Nair
+"""
+
+import argparse
+import html
+import logging
+import os
+import re
+import time
+import uuid
+from datetime import datetime
+
+import charts
+from config import (ANOMALY_THRESHOLD, DEFAULT_TOP_N, HISTORY_PATH, LOCAL_SOURCES, MOMENTUM_BASELINE,
+                    MOMENTUM_WINDOW, REPORT_SNAPSHOT_DIR, SHEET_TIMEOUT, SHEET_URLS, USE_GOOGLE_SHEETS)
+from cube import market_cubes
+from data_loader import TABS, load_default_data, load_sheets
+from history import HistoryStore
+from momentum import platform_momentum, status_column
+from snapshot_cache import SnapshotCache, content_version, frame_hash
+from sources import load_tabs
+from transforms import build_rankings_table, content_breakdown, genre_counts, kpi_tiles
+
+logger = logging.getLogger(__name__)
+
+# Tables are capped so the file stays small enough to open on a phone;
+# the downloads in the live dashboard cover the full data
+DEFAULT_MAX_RAW_ROWS = 1000
+
+# Bump when the page layout changes so existing reports get re-rendered
+REPORT_FORMAT = 3
+
+VERSION_META = re.compile(r'<meta name="report-version" content="([^"]*)">')
+
+STYLE = """
+body { font-family: 'DM Sans', -apple-system, 'Segoe UI', sans-serif; color: #1e293b; background: #fff;
+       max-width: 1400px; margin: 0 auto; padding: 2rem; }
+h1 { margin-bottom: 0.25rem; }
+h2 { font-size: 1.5rem; margin-top: 2.5rem; border-bottom: 1px solid #e2e8f0; padding-bottom: 0.5rem; }
+.meta { color: #64748b; font-size: 0.9rem; }
+.stale { color: #b45309; }
+.kpis { display: grid; grid-template-columns: repeat(5, 1fr); gap: 1rem; margin: 1.5rem 0; }
+.kpi { border: 1px solid #e2e8f0; border-radius: 8px; padding: 1rem; }
+.kpi .label { color: #64748b; font-size: 0.85rem; }
+.kpi .value { font-size: 1.75rem; font-weight: 700; }
+.kpi .delta { color: #059669; font-size: 0.85rem; }
+.row { display: grid; gap: 1rem; grid-template-columns: repeat(var(--cols), minmax(0, 1fr)); }
+.row.wide-left { grid-template-columns: 2fr 1fr; }
+table.data { border-collapse: collapse; width: 100%; font-size: 0.9rem; }
+table.data th, table.data td { padding: 0.4rem 0.6rem; border-bottom: 1px solid #e2e8f0; text-align: left; }
+table.data th { background: #f8fafc; }
+.scroll { max-height: 420px; overflow: auto; }
+@media (max-width: 900px) { .kpis, .row, .row.wide-left { grid-template-columns: 1fr; } }
+"""
+
+
+# ============================================
+# DATA
+# ============================================
+
+def load_snapshot(cache=None, history=None):
+    """
+    ``(snapshot, tab_status)`` in the same shape as ``SnapshotCache``.
+
+    With a ``cache`` the sheets and local sources are refreshed through it
+    first (conditional fetches, saved snapshot as fallback), and a new
+    version's live tabs are recorded in ``history``; without one the
+    built-in default data is used.
+    """
+    if cache is not None:
+        sheets = SHEET_URLS if USE_GOOGLE_SHEETS else {}
+
+        def record_history(snapshot, changed_tabs, status):
+            tabs = [tab for tab in ("platforms", "titles", "genres") if status[tab]["live"]]
+            if history is not None and tabs:
+                history.record(snapshot, tabs)
+
+        cache.refresh(lambda tabs, previous: load_tabs(
+            LOCAL_SOURCES, lambda rest, prior: load_sheets(sheets, timeout=SHEET_TIMEOUT, tabs=rest, previous=prior),
+            tabs=tabs, previous=previous), before_publish=record_history)
+        return cache.current, cache.status
+
+    data = load_default_data()
+    hashes = {tab: frame_hash(data[tab]) for tab in TABS}
+    snapshot = {"version": content_version(hashes), "saved_at": time.time(), "hashes": hashes, "data": data}
+    return snapshot, None
+
+
+def history_week(history, tab_status):
+    """Week the platforms on show were recorded in, or None when there is no history for them"""
+    if history is None or tab_status is None or tab_status["platforms"]["source"] == "default":
+        return None
+    return history.recorded_week("platforms")
+
+
+def report_version(snapshot, top_n, max_raw_rows, week=None):
+    """Everything the rendered page depends on"""
+    return f"{snapshot['version']}-w{week or 'none'}-n{top_n}-r{max_raw_rows}-f{REPORT_FORMAT}"
+
+
+def existing_version(path):
+    """Report version stamped in the file at ``path``, or None"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            head = f.read(4096)
+    except OSError:
+        return None
+    match = VERSION_META.search(head)
+    return match.group(1) if match else None
+
+
+# ============================================
+# RENDERING
+# ============================================
+
+def _table(df, max_rows=None):
+    shown = df if max_rows is None else df.head(max_rows)
+    body = shown.to_html(index=False, border=0, classes="data", na_rep="")
+    note = ""
+    if len(shown) < len(df):
+        note = f'<p class="meta">Showing the first {len(shown):,} of {len(df):,} rows.</p>'
+    return f'<div class="scroll">{body}</div>{note}'
+
+
+def _row(*cells, cls=""):
+    inner = "".join(f"<div>{cell}</div>" for cell in cells)
+    return f'<div class="row {cls}" style="--cols: {len(cells)}">{inner}</div>'
+
+
+class _Figures:
+    """HTML for each figure; plotly.js is inlined with the first one only"""
+
+    def __init__(self):
+        self.first = True
+
+    def __call__(self, fig):
+        out = charts.compact(fig).to_html(full_html=False, include_plotlyjs=self.first,
+                          config={"displaylogo": False, "responsive": True})
+        self.first = False
+        return out
+
+
+def _rankings_table(df_platforms, history, week):
+    """Rankings as on the live dashboard: rank changes and status from the history when there is one"""
+    if not week:
+        return build_rankings_table(df_platforms)
+    moves = platform_momentum(history.platform_weeks(weeks=MOMENTUM_WINDOW + MOMENTUM_BASELINE + 1, until=week),
+                              MOMENTUM_WINDOW, MOMENTUM_BASELINE, ANOMALY_THRESHOLD)
+    status = status_column(df_platforms, moves, MOMENTUM_WINDOW)
+    return build_rankings_table(df_platforms, history.previous_ranks(week), status)
+
+
+def _regions_table(df_regions, max_rows):
+    shown = df_regions.copy()
+    shown["market_share"] = shown["market_share"].map(lambda x: f"{float(str(x))}%")
+    shown["revenue_q1"] = shown["revenue_q1"].map(lambda x: f"${x:,.0f}")
+    shown["growth"] = shown["growth"].map(lambda x: f"{x:.0f}%")
+    shown = shown.rename(columns={"region": "Region", "market_share": "Market Share %",
+                                  "revenue_q1": "Q1 Revenue ($M)", "growth": "YoY Growth %",
+                                  "top_platform": "Leading Platform"})
+    return _table(shown, max_rows)
+
+
+def _status_line(snapshot, tab_status):
+    saved = datetime.fromtimestamp(snapshot["saved_at"]).strftime("%b %d, %Y %H:%M")
+    parts = [f"Data version {html.escape(snapshot['version'])} · saved {saved}"]
+    if tab_status is None:
+        parts.append("default dataset")
+    else:
+        for tab, s in tab_status.items():
+            if not s["live"]:
+                reason = html.escape(s["error"] or "revalidating")
+                parts.append(f'<span class="stale">{tab} stale ({s["source"]} data): {reason}</span>')
+    return " · ".join(parts)
+
+
+def render(snapshot, tab_status=None, top_n=DEFAULT_TOP_N, max_raw_rows=DEFAULT_MAX_RAW_ROWS, history=None):
+    """The full report page as an HTML string"""
+    week = history_week(history, tab_status)
+    data = snapshot["data"]
+    df_platforms, df_titles = data["platforms"], data["titles"]
+    df_genres, df_regions = data["genres"], data["regions"]
+    figure = _Figures()
+    cubes = market_cubes(data)
+
+    kpis = "".join(
+        f'<div class="kpi"><div class="label">{html.escape(label)}</div>'
+        f'<div class="value">{html.escape(str(value))}</div>'
+        f'<div class="delta">{html.escape(delta)}</div></div>'
+        for label, value, delta in kpi_tiles(cubes["platforms"])
+    )
+
+    title_genres = genre_counts(cubes["titles"])
+    breakdown = "".join(f"<p><b>{html.escape(label)}:</b> {html.escape(str(value))}</p>"
+                        for label, value in content_breakdown(cubes["titles"], title_genres))
+
+    raw = "".join(f"<h3>{tab.title()}</h3>{_table(data[tab], max_raw_rows)}" for tab in TABS)
+
+    sections = [
+        f'<div class="kpis">{kpis}</div>',
+        "<h2>📱 Platform Rankings</h2>",
+        _table(_rankings_table(df_platforms, history, week), max_raw_rows),
+        _row(figure(charts.revenue_by_platform(df_platforms, top_n=top_n)),
+             figure(charts.us_share_by_platform(df_platforms, top_n=top_n))),
+        "<h2>🔥 Trending Content</h2>",
+        _row(figure(charts.top_titles(df_titles, top_n=top_n)),
+             "<b>📋 Content Breakdown</b>" + figure(charts.genre_mix(title_genres)) + breakdown,
+             cls="wide-left"),
+        "<h2>📊 Genre Analysis</h2>",
+        _row(figure(charts.genre_bar(df_genres, 'market_share', 'Market Share (%)', 'Purples', top_n=top_n)),
+             figure(charts.genre_bar(df_genres, 'growth_rate', 'YoY Growth Rate (%)', 'Oranges', top_n=top_n)),
+             figure(charts.genre_bar(df_genres, 'avg_completion', 'Completion Rate (%)', 'Greens', top_n=top_n))),
+        "<h2>🌍 Regional Breakdown</h2>",
+        _row(figure(charts.region_share(df_regions, top_n=top_n)),
+             figure(charts.region_growth(df_regions, top_n=top_n))),
+        _regions_table(df_regions, max_raw_rows),
+        "<h2>📥 Raw Data</h2>",
+        raw,
+    ]
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="report-version" content="{html.escape(report_version(snapshot, top_n, max_raw_rows, week))}">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Micro-Drama Intelligence</title>
+<style>{STYLE}</style>
+</head>
+<body>
+<h1>🎬 Micro-Drama Market Intelligence</h1>
+<p class="meta">{_status_line(snapshot, tab_status)} · generated {datetime.now().strftime("%b %d, %Y %H:%M")}</p>
+{"".join(sections)}
+<p class="meta">Static snapshot of the Micro-Drama Intelligence dashboard.</p>
+</body>
+</html>
+"""
+
+
+def write_report(path, page):
+    """Write ``page`` to ``path`` atomically, so readers never see half a file"""
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    tmp = os.path.join(folder, f".{os.path.basename(path)}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(page)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def build(path, cache=None, top_n=DEFAULT_TOP_N, max_raw_rows=DEFAULT_MAX_RAW_ROWS, force=False, history=None):
+    """
+    Load the data and re-render ``path`` if its version is out of date.
+
+    Returns the report version when a new file was written, else None.
+    """
+    snapshot, tab_status = load_snapshot(cache, history)
+    version = report_version(snapshot, top_n, max_raw_rows, history_week(history, tab_status))
+    if not force and existing_version(path) == version:
+        return None
+    write_report(path, render(snapshot, tab_status, top_n=top_n, max_raw_rows=max_raw_rows, history=history))
+    return version
+
+
+# ============================================
+# COMMAND LINE
+# ============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the dashboard to a static HTML file")
+    parser.add_argument("--out", default="report.html", help="Output file (default: report.html)")
+    parser.add_argument("--default-data", action="store_true",
+                        help="Use the built-in dataset instead of the Google Sheets and local sources")
+    parser.add_argument("--top-n", type=int, default=DEFAULT_TOP_N,
+                        help="Bars / slices in the title and platform charts before \"Other\"")
+    parser.add_argument("--max-raw-rows", type=int, default=DEFAULT_MAX_RAW_ROWS,
+                        help="Rows shown per table")
+    parser.add_argument("--force", action="store_true", help="Re-render even if the data version is unchanged")
+    parser.add_argument("--watch", action="store_true", help="Keep running and re-render when the data changes")
+    parser.add_argument("--interval", type=float, default=300, help="Seconds between checks with --watch")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    use_sources = bool((USE_GOOGLE_SHEETS and any(SHEET_URLS.values())) or LOCAL_SOURCES) and not args.default_data
+    cache = SnapshotCache(REPORT_SNAPSHOT_DIR) if use_sources else None
+    history = HistoryStore(HISTORY_PATH) if use_sources else None
+    force = args.force
+    while True:
+        try:
+            version = build(args.out, cache, top_n=args.top_n, max_raw_rows=args.max_raw_rows, force=force,
+                            history=history)
+            if version:
+                logger.info("Wrote %s (%s)", args.out, version)
+            else:
+                logger.info("%s is up to date", args.out)
+        except Exception:
+            if not args.watch:
+                raise
+            logger.exception("Report build failed")
+        force = False
+        if not args.watch:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Declared column types for the four dashboard tabs.
+
+Frames are coerced once at load time: repeated labels become categoricals,
+numbers are narrowed, and ``views_est`` text like "180M" becomes a number.
+Values that can't be coerced turn into NaN and are reported per row on
+``df.attrs["schema_issues"]`` instead of blowing up the chart code later.
+"""
+
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+# Column kinds:
+#   category  repeated label, stored as pandas Categorical
+#   string    free text
+#   int       whole number, downcast to the narrowest integer that fits
+#             (float64 if the column has gaps or fractions)
+#   float32   measure where 7 significant digits are plenty (ratings, %)
+#   views     view counts written like "180M", "1.2B" or "950K"
+SCHEMAS = {
+    "platforms": {
+        "platform": "category",
+        "company": "string",
+        "origin": "category",
+        "score": "float32",
+        "installs": "int",
+        "revenue_2024": "int",
+        "revenue_q1_2025": "int",
+        "rank_current": "int",
+        "rank_last_week": "int",
+        "us_share": "float32",
+        "content_count": "int",
+        "monetization": "category",
+        "threat_level": "category",
+    },
+    "titles": {
+        "title": "string",
+        "platform": "category",
+        "genre": "category",
+        "sub_genre": "category",
+        "episodes": "int",
+        "revenue_est": "int",
+        "views_est": "views",
+        "weeks_trending": "int",
+        "status": "category",
+    },
+    "genres": {
+        "genre": "category",
+        "market_share": "float32",
+        "growth_rate": "float32",
+        "avg_completion": "float32",
+    },
+    "regions": {
+        "region": "category",
+        "market_share": "float32",
+        "revenue_q1": "int",
+        "growth": "int",
+        "top_platform": "category",
+    },
+}
+
+# Stamped on saved snapshots so frames typed under an older schema get
+# re-coerced (and their tabs re-parsed) after an upgrade
+SCHEMA_VERSION = hashlib.sha256(json.dumps(SCHEMAS, sort_keys=True).encode()).hexdigest()[:12]
+
+VIEW_SUFFIXES = {"": 1, "K": 1_000, "M": 1_000_000, "B": 1_000_000_000}
+
+
+def parse_views(series):
+    """Vectorised "180M" / "1.2B" / "950,000" -> float64 view count (NaN if unparseable)"""
+    parts = series.astype("string").str.strip().str.upper().str.extract(r"^([\d.,]+)\s*([KMB]?)$")
+    number = pd.to_numeric(parts[0].str.replace(",", "", regex=False), errors="coerce")
+    return (number * parts[1].map(VIEW_SUFFIXES)).astype("float64")
+
+
+def _to_number(series):
+    if series.dtype.kind in "biuf":
+        return series
+    # Sheets users type "50,000,000", "$180" or "55%" as often as plain numbers
+    cleaned = series.astype("string").str.replace(r"[,$%\s]", "", regex=True)
+    return pd.to_numeric(cleaned, errors="coerce")
+
+
+def _coerce(series, kind):
+    if kind == "category":
+        return series.astype("category")
+    if kind == "string":
+        return series.astype("string")
+    if kind == "views":
+        return parse_views(series)
+    number = _to_number(series)
+    if kind == "int":
+        if number.notna().all() and (number == np.floor(number)).all():
+            return pd.to_numeric(number.astype("int64"), downcast="integer")
+        return number.astype("float64")
+    return number.astype(kind)
+
+
+def apply_schema(tab, df):
+    """
+    Return a copy of ``df`` coerced to the tab's declared schema.
+
+    Columns not in the schema pass through untouched. Every value that was
+    present but could not be coerced is listed on
+    ``attrs["schema_issues"]`` as ``{"row", "column", "value"}``; a declared
+    column missing from the sheet is reported with ``row`` None.
+    """
+    schema = SCHEMAS.get(tab, {})
+    typed = df.copy()
+    issues = []
+    for column, kind in schema.items():
+        if column not in typed.columns:
+            issues.append({"row": None, "column": column, "value": "missing column"})
+            continue
+        original = typed[column]
+        coerced = _coerce(original, kind)
+        if kind not in ("category", "string"):
+            bad = coerced.isna() & original.notna()
+            for row, value in original[bad].items():
+                issues.append({"row": row, "column": column, "value": str(value)})
+        typed[column] = coerced
+    typed.attrs["schema_issues"] = issues
+    return typed
+
+
+def schema_issues(df):
+    return df.attrs.get("schema_issues", [])
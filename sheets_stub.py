@@ -0,0 +1,137 @@
+"""
+Local stand-in for the published Google Sheets CSV endpoints.
+
+Serves each tab at ``/<tab>.csv`` so the dashboard and the loader can be
+exercised offline. Tabs can be made slow or broken to check the per-tab
+timeout and fallback behaviour.
+
+USAGE:
+    python sheets_stub.py --port 8765 --delay titles=15 --fail genres
+    SHEETS_BASE_URL=http://127.0.0.1:8765 streamlit run app2.py
+
+Author: Vinitha Nair
+"""
+
+import argparse
+import hashlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from data_loader import TABS, load_default_data
+
+
+def _default_payloads(data_dir=None):
+    """CSV bytes for each tab, from ``data_dir/<tab>.csv`` or the default data"""
+    if data_dir:
+        payloads = {}
+        for tab in TABS:
+            with open(os.path.join(data_dir, f"{tab}.csv"), "rb") as f:
+                payloads[tab] = f.read()
+        return payloads
+    return {tab: df.to_csv(index=False).encode("utf-8") for tab, df in load_default_data().items()}
+
+
+def make_server(host="127.0.0.1", port=0, payloads=None, delays=None, failures=(), conditional=True):
+    """
+    Build (but don't start) a stub server.
+
+    ``payloads`` maps tab -> CSV bytes, ``delays`` maps tab -> seconds to
+    sleep before answering and ``failures`` lists tabs that return HTTP 500.
+    With ``conditional`` the server sends ETags and answers 304 to a
+    matching If-None-Match (Google often doesn't, so it can be turned off).
+    ``hits`` counts requests per tab. The attributes are kept on the server
+    so callers can change them while it is running. Pass ``port=0`` to pick
+    a free port.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            tab = self.path.split("?")[0].strip("/").removesuffix(".csv")
+            if tab not in self.server.payloads:
+                self.send_error(404, f"unknown tab {tab!r}")
+                return
+            time.sleep(self.server.delays.get(tab, 0))
+            if tab in self.server.failures:
+                self.send_error(500, f"simulated failure for {tab!r}")
+                return
+            body = self.server.payloads[tab]
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            self.server.hits[tab] = self.server.hits.get(tab, 0) + 1
+            if self.server.conditional and self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/csv; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            if self.server.conditional:
+                self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.payloads = dict(payloads if payloads is not None else _default_payloads())
+    server.delays = dict(delays or {})
+    server.failures = set(failures)
+    server.conditional = conditional
+    server.hits = {}
+    return server
+
+
+def base_url(server):
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+def stub_urls(base):
+    """``SHEET_URLS``-shaped dict pointing at a stub server"""
+    return {tab: f"{base.rstrip('/')}/{tab}.csv" for tab in TABS}
+
+
+def start_in_background(**kwargs):
+    """Start a stub server on a daemon thread and return it"""
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _parse_delays(items):
+    delays = {}
+    for item in items:
+        tab, _, seconds = item.partition("=")
+        delays[tab] = float(seconds)
+    return delays
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the dashboard tabs as CSV over local HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--data-dir", help="Directory containing <tab>.csv files (default: built-in data)")
+    parser.add_argument("--delay", action="append", default=[], metavar="TAB=SECONDS",
+                        help="Delay responses for a tab (repeatable)")
+    parser.add_argument("--fail", action="append", default=[], metavar="TAB",
+                        help="Answer HTTP 500 for a tab (repeatable)")
+    parser.add_argument("--no-etag", action="store_true", help="Don't send ETags or answer 304")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, _default_payloads(args.data_dir),
+                         _parse_delays(args.delay), args.fail, not args.no_etag)
+    print(f"Serving sheet stand-in at {base_url(server)}")
+    for tab, url in stub_urls(base_url(server)).items():
+        print(f"  {tab:<10} {url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
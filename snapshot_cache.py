@@ -0,0 +1,196 @@
+"""
+On-disk snapshot cache for the dashboard data.
+
+Every successful load is written to Parquet under a content-hash version
+stamp. A restarted process paints straight from the last snapshot while the
+background refresher revalidates it, and new frames are swapped in only when
+their content actually changed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+from data_loader import TABS
+from schema import SCHEMA_VERSION, apply_schema
+
+logger = logging.getLogger(__name__)
+
+# Published frames are shared by every session: with copy-on-write a frame
+# derived from one (a filter, a sort, a new column) never writes through to
+# it, and slices share its memory until someone writes to them. Always on
+# from pandas 3.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "snapshots")
+MANIFEST = "manifest.json"
+
+
+def frame_hash(df):
+    """Stable content hash of a frame (columns, dtypes and values)"""
+    h = hashlib.sha256()
+    h.update(json.dumps([[str(c) for c in df.columns], [str(t) for t in df.dtypes]]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.hexdigest()
+
+
+def tab_version(hashes, *tabs):
+    """Cache key covering only the given tabs"""
+    return "-".join(hashes[tab][:12] for tab in tabs)
+
+
+def content_version(hashes):
+    """Short version stamp combining the per-tab hashes"""
+    return hashlib.sha256("".join(hashes[tab] for tab in TABS).encode()).hexdigest()[:12]
+
+
+class SnapshotCache:
+    """
+    The current data version plus its on-disk copy.
+
+    ``current`` is a dict with ``version``, ``saved_at``, ``hashes`` and
+    ``data`` (tab -> DataFrame); it is replaced wholesale, never mutated, so
+    readers can hold on to it without locking. ``hashes`` holds one content
+    hash per tab, so derived data can be keyed on just the tabs it reads.
+    ``status`` maps each tab to ``{"live", "source", "error"}`` where source
+    is ``sheets``, ``local`` (see sources.py), ``snapshot`` or ``default``. ``validators`` keeps each
+    tab's ETag / Last-Modified / byte hash for conditional fetches.
+    """
+
+    def __init__(self, directory=DEFAULT_DIR):
+        self.directory = directory
+        self.checked_at = None
+        self._lock = threading.Lock()
+        self.validators = {}
+        self.current, self.status = self._read()
+
+    # ---- disk -------------------------------------------------------------
+
+    def _read(self):
+        try:
+            with open(os.path.join(self.directory, MANIFEST)) as f:
+                manifest = json.load(f)
+            folder = os.path.join(self.directory, manifest["version"])
+            data = {tab: pd.read_parquet(os.path.join(folder, f"{tab}.parquet")) for tab in TABS}
+        except FileNotFoundError:
+            return None, None
+        except Exception:
+            logger.exception("Ignoring unreadable snapshot in %s", self.directory)
+            return None, None
+
+        live_tabs = set(manifest.get("live_tabs", TABS))
+        status = {tab: {"live": False, "source": "snapshot" if tab in live_tabs else "default", "error": None}
+                  for tab in TABS}
+        self.validators = manifest.get("validators", {})
+        if manifest.get("schema") != SCHEMA_VERSION:
+            data = {tab: apply_schema(tab, df) for tab, df in data.items()}
+            self.validators = {}
+        snapshot = {"version": manifest["version"], "saved_at": manifest["saved_at"],
+                    "hashes": manifest["hashes"], "data": data}
+        return snapshot, status
+
+    def _write(self, snapshot, live_tabs, validators):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = os.path.join(self.directory, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(tmp)
+        for tab in TABS:
+            snapshot["data"][tab].to_parquet(os.path.join(tmp, f"{tab}.parquet"), index=False)
+        folder = os.path.join(self.directory, snapshot["version"])
+        shutil.rmtree(folder, ignore_errors=True)
+        os.replace(tmp, folder)
+
+        manifest = {"version": snapshot["version"], "saved_at": snapshot["saved_at"],
+                    "hashes": snapshot["hashes"], "live_tabs": sorted(live_tabs),
+                    "validators": validators, "schema": SCHEMA_VERSION}
+        tmp_manifest = os.path.join(self.directory, f".{MANIFEST}.{uuid.uuid4().hex}")
+        with open(tmp_manifest, "w") as f:
+            json.dump(manifest, f, indent=2)
+        # Readers only ever follow the manifest, so swapping it last keeps
+        # the on-disk snapshot consistent even if we die half way through.
+        os.replace(tmp_manifest, os.path.join(self.directory, MANIFEST))
+
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if os.path.isdir(path) and name != snapshot["version"] and not name.startswith(".tmp-"):
+                shutil.rmtree(path, ignore_errors=True)
+
+    # ---- refresh ----------------------------------------------------------
+
+    def refresh(self, fetch, tabs=TABS, before_publish=None):
+        """
+        Run ``fetch(tabs, previous)`` (returning ``(data, status)`` like
+        ``load_sheets``) and publish the result if its content differs from
+        the current version.
+
+        Only ``tabs`` are fetched; the others keep their current frame and
+        status. Unchanged tabs keep their frame object and hash, so anything
+        derived from them stays valid. Tabs that failed keep their previous
+        snapshot frame when there is one. Returns the list of tabs whose
+        content changed (empty when nothing new was published).
+
+        ``before_publish(snapshot, changed_tabs, status)`` runs once a new
+        version is saved but before it and ``status`` become current, so
+        whatever it records (e.g. the history) is in place before any reader
+        can see the version.
+        """
+        previous = self.current
+        prior = {}
+        if previous is not None:
+            prior = {tab: {"frame": previous["data"][tab], **self.validators.get(tab, {})} for tab in tabs}
+        data, fetch_status = fetch(tabs, prior)
+        now = time.time()
+
+        merged, status, hashes = {}, {}, {}
+        validators, live_tabs = dict(self.validators), set()
+        for tab in TABS:
+            if tab not in tabs and previous is not None:
+                merged[tab], hashes[tab], status[tab] = previous["data"][tab], previous["hashes"][tab], self.status[tab]
+                if status[tab]["source"] != "default":
+                    live_tabs.add(tab)
+                continue
+
+            error = fetch_status[tab]["error"] if tab in fetch_status else "not fetched"
+            live = tab in fetch_status and fetch_status[tab]["live"]
+            if live:
+                merged[tab], source = data[tab], fetch_status[tab].get("source", "sheets")
+                validators[tab] = fetch_status[tab]["validators"]
+                live_tabs.add(tab)
+            elif previous is not None and self.status[tab]["source"] != "default":
+                merged[tab], source = previous["data"][tab], "snapshot"
+                live_tabs.add(tab)
+            else:
+                merged[tab], source = data[tab], "default"
+            status[tab] = {"live": live, "source": source, "error": error}
+
+            if previous is not None and merged[tab] is previous["data"][tab]:
+                hashes[tab] = previous["hashes"][tab]
+            else:
+                hashes[tab] = frame_hash(merged[tab])
+
+        version = content_version(hashes)
+        changed_tabs = [tab for tab in TABS if previous is None or hashes[tab] != previous["hashes"][tab]]
+        if changed_tabs:
+            snapshot = {"version": version, "saved_at": now, "hashes": hashes, "data": merged}
+            if live_tabs:
+                try:
+                    self._write(snapshot, live_tabs, validators)
+                except Exception:
+                    logger.exception("Could not write snapshot %s", version)
+            if before_publish is not None:
+                before_publish(snapshot, changed_tabs, status)
+
+        with self._lock:
+            if changed_tabs:
+                self.current = snapshot
+            self.status = status
+            self.validators = validators
+            self.checked_at = now
+        return changed_tabs
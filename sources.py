@@ -0,0 +1,269 @@
+"""
+Local file and database sources for the dashboard tabs.
+
+Any tab can be read from a local CSV, Parquet or SQLite source instead of
+its Google Sheet. Sources are read in chunks, and only what the dashboard
+uses is kept:
+
+- Column pruning: only the tab's schema columns are read (see
+  ``schema.SCHEMAS``).
+- Row filters: ``filters`` are pushed down to the source where it can
+  evaluate them. Parquet skips row groups by their statistics, and SQLite
+  gets a WHERE clause. CSV chunks are filtered as they are parsed.
+
+Each chunk is typed on its own and the chunks are concatenated at the end,
+so a multi-GB vendor export never sits in memory as raw text. The result
+has the same ``(data, status)`` contract as ``data_loader.load_sheets``. An
+unchanged file (same size, modification time and source settings) is not
+read again.
+"""
+
+import hashlib
+import json
+import operator
+import os
+import sqlite3
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from data_loader import TABS, default_frame
+from schema import SCHEMAS, apply_schema
+
+# Rows per chunk when a source doesn't set its own "chunk_rows"
+CHUNK_ROWS = 200_000
+
+# Row filter operators: (column, op, value) with value a list for "in" / "not in"
+OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+FORMATS = {
+    ".csv": "csv",
+    ".gz": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".sqlite": "sqlite",
+    ".sqlite3": "sqlite",
+    ".db": "sqlite",
+}
+
+
+def source_format(source):
+    """``csv``, ``parquet`` or ``sqlite``: the source's "format", or guessed from its path"""
+    if source.get("format"):
+        return source["format"]
+    path = source["path"]
+    if os.path.isdir(path):
+        return "parquet"
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix not in FORMATS:
+        raise ValueError(f"can't tell the format of {path}; set \"format\" to csv, parquet or sqlite")
+    return FORMATS[suffix]
+
+
+def _filters(source):
+    """The source's row filters as (column, op, value) tuples, checked"""
+    filters = [tuple(f) for f in source.get("filters", [])]
+    for column, op, value in filters:
+        if op not in OPERATORS and op not in ("in", "not in"):
+            raise ValueError(f"unsupported filter operator {op!r} on {column}")
+    return filters
+
+
+def _mask(df, filters):
+    """Rows of a typed chunk passing every filter"""
+    mask = pd.Series(True, index=df.index)
+    for column, op, value in filters:
+        if op == "in":
+            mask &= df[column].isin(value)
+        elif op == "not in":
+            mask &= ~df[column].isin(value)
+        else:
+            mask &= OPERATORS[op](df[column], value).fillna(False).astype(bool)
+    return mask
+
+
+# ---- readers ------------------------------------------------------------
+# Each yields raw (untyped) chunks holding only the wanted columns; rows are
+# already filtered unless the reader says otherwise.
+
+def _read_csv(source, columns, filters, chunk_rows):
+    wanted = set(columns) | {column for column, _, _ in filters}
+    # Filters are applied after typing; low_memory off only means each chunk
+    # is type-inferred in one go, which is what silences mixed-type warnings
+    options = {"low_memory": False, **source.get("read_options", {})}
+    yield from pd.read_csv(source["path"], usecols=lambda c: c in wanted, chunksize=chunk_rows, **options)
+
+
+def _arrow_filter(filters):
+    import pyarrow.dataset as ds
+
+    expression = None
+    for column, op, value in filters:
+        field = ds.field(column)
+        if op == "in":
+            term = field.isin(value)
+        elif op == "not in":
+            term = ~field.isin(value)
+        else:
+            term = OPERATORS[op](field, value)
+        expression = term if expression is None else expression & term
+    return expression
+
+
+def _read_parquet(source, columns, filters, chunk_rows):
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(source["path"], format="parquet")
+    present = [c for c in columns if c in dataset.schema.names]
+    for batch in dataset.to_batches(columns=present, filter=_arrow_filter(filters), batch_size=chunk_rows):
+        yield batch.to_pandas()
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _read_sqlite(source, columns, filters, chunk_rows):
+    if not source.get("table"):
+        raise ValueError(f"SQLite source {source['path']} needs a \"table\"")
+    # Read-only, so a vendor database is never locked or modified by the dashboard
+    conn = sqlite3.connect(f"file:{source['path']}?mode=ro", uri=True)
+    try:
+        table = _quote(source["table"])
+        present = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if not present:
+            raise ValueError(f"no table {source['table']!r} in {source['path']}")
+        selected = ", ".join(_quote(c) for c in columns if c in present) or "*"
+        where, params = [], []
+        for column, op, value in filters:
+            if op in ("in", "not in"):
+                where.append(f"{_quote(column)} {op.upper()} ({', '.join('?' * len(value))})")
+                params.extend(value)
+            else:
+                where.append(f"{_quote(column)} {op} ?")
+                params.append(value)
+        sql = f"SELECT {selected} FROM {table}" + (f" WHERE {' AND '.join(where)}" if where else "")
+        yield from pd.read_sql_query(sql, conn, params=params, chunksize=chunk_rows)
+    finally:
+        conn.close()
+
+
+READERS = {
+    "csv": _read_csv,
+    "parquet": _read_parquet,
+    "sqlite": _read_sqlite,
+}
+
+
+def _concat(tab, chunks):
+    """One typed frame from typed chunks, merging each chunk's categories"""
+    if len(chunks) == 1:
+        return chunks[0].reset_index(drop=True)
+    frame = pd.concat(chunks, ignore_index=True)
+    for column, kind in SCHEMAS.get(tab, {}).items():
+        if kind == "category" and column in frame:
+            try:
+                frame[column] = union_categoricals([chunk[column] for chunk in chunks])
+            except TypeError:
+                # A chunk where the column was all empty has categories of
+                # another dtype; fall back to re-encoding the whole column
+                frame[column] = frame[column].astype("category")
+    return frame
+
+
+def read_source(tab, source):
+    """
+    Read one tab from ``source`` (see ``LOCAL_SOURCES`` in config.py), typed
+    by its schema. Schema issues carry the row number in the source as read.
+    """
+    fmt = source_format(source)
+    columns = list(SCHEMAS.get(tab, {}))
+    filters = _filters(source)
+    chunk_rows = source.get("chunk_rows", CHUNK_ROWS)
+    # Parquet and SQLite evaluate the filters themselves
+    pushed_down = fmt != "csv"
+
+    chunks, issues, offset = [], [], 0
+    for raw in READERS[fmt](source, columns, filters, chunk_rows):
+        if fmt != "csv":
+            # CSV chunks are already numbered by file row
+            raw.index = pd.RangeIndex(offset, offset + len(raw))
+        offset += len(raw)
+        typed = apply_schema(tab, raw)
+        # A declared column missing from the source is reported by every chunk
+        issues.extend(i for i in typed.attrs["schema_issues"] if i["row"] is not None or not chunks)
+        if not pushed_down and filters:
+            typed = typed[_mask(typed, filters)]
+        # Keep the first chunk even when empty so the frame has its columns
+        if len(typed) or not chunks:
+            chunks.append(typed[[c for c in typed.columns if c in columns]])
+
+    frame = _concat(tab, chunks) if chunks else apply_schema(tab, pd.DataFrame(columns=columns))
+    frame.attrs["schema_issues"] = issues
+    return frame
+
+
+def source_validators(source):
+    """
+    Size and modification time of the source's files plus a hash of its
+    settings, so a changed file or filter forces a re-read.
+    """
+    path = source["path"]
+    if os.path.isdir(path):
+        files = [os.path.join(root, name) for root, _, names in os.walk(path) for name in names]
+    else:
+        # SQLite keeps recent writes in the -wal file until a checkpoint
+        files = [path] + [path + suffix for suffix in ("-wal",) if os.path.exists(path + suffix)]
+    stats = [os.stat(f) for f in files]
+    settings = json.dumps(source, sort_keys=True, default=str)
+    return {"size": sum(s.st_size for s in stats), "mtime_ns": max((s.st_mtime_ns for s in stats), default=0),
+            "settings_hash": hashlib.sha256(settings.encode()).hexdigest()[:12]}
+
+
+def load_local(sources, tabs=TABS, previous=None):
+    """
+    Read ``tabs`` from their local ``sources``, like ``load_sheets``.
+
+    Returns ``(data, status)`` with a default frame and the error for any
+    tab that couldn't be read. Tabs whose source is unchanged since
+    ``previous`` keep the previous frame and report ``changed`` False.
+    """
+    previous = previous or {}
+    data, status = {}, {}
+    for tab in tabs:
+        source = sources[tab]
+        prior = previous.get(tab) or {}
+        try:
+            validators = source_validators(source)
+            unchanged = prior.get("frame") is not None and all(prior.get(k) == v for k, v in validators.items())
+            data[tab] = prior["frame"] if unchanged else read_source(tab, source)
+            status[tab] = {"live": True, "source": "local", "error": None, "changed": not unchanged,
+                           "validators": validators}
+        except Exception as e:
+            data[tab] = default_frame(tab)
+            status[tab] = {"live": False, "source": "local", "error": f"{source['path']}: {e}",
+                           "changed": True, "validators": None}
+    return data, status
+
+
+def load_tabs(sources, fallback, tabs=TABS, previous=None):
+    """
+    Read the tabs that have a local source, and get the rest from
+    ``fallback(tabs, previous)`` (e.g. the Google Sheets loader).
+    """
+    previous = previous or {}
+    local = [tab for tab in tabs if sources.get(tab)]
+    remote = [tab for tab in tabs if tab not in local]
+    data, status = load_local(sources, local, previous) if local else ({}, {})
+    if remote:
+        remote_data, remote_status = fallback(remote, {tab: previous[tab] for tab in remote if tab in previous})
+        data.update(remote_data)
+        status.update(remote_status)
+    return data, status
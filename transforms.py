@@ -0,0 +1,210 @@
+"""
+Table and number formatting shared by the dashboard and its tooling.
+
+The column builders work on whole columns at once; the scalar helpers are
+kept for one-off values such as the KPI tiles, and define the exact text the
+column builders must reproduce.
+"""
+
+import numpy as np
+import pandas as pd
+
+from cube import mean
+
+RANKINGS_COLUMNS = {
+    'rank_current': 'Rank',
+    'change': 'Δ',
+    'platform': 'Platform',
+    'company': 'Company',
+    'origin': 'Origin',
+    'downloads_fmt': 'Downloads',
+    'revenue_fmt': 'Q1 Revenue',
+    'rating_fmt': 'Rating',
+    'us_share_fmt': 'US Share',
+    'content_count': 'Titles',
+    'threat_level': 'Status',
+}
+
+
+def format_number(num):
+    if num >= 1_000_000_000:
+        return f"{num/1_000_000_000:.1f}B"
+    elif num >= 1_000_000:
+        return f"{num/1_000_000:.0f}M"
+    elif num >= 1_000:
+        return f"{num/1_000:.0f}K"
+    return str(num)
+
+
+def get_rank_change_indicator(current, last_week):
+    change = last_week - current
+    if change > 0:
+        return f"🟢 +{change}"
+    elif change < 0:
+        return f"🔴 {change}"
+    return "⚪ —"
+
+
+def format_distinct(values, fn):
+    """
+    Apply the scalar formatter ``fn`` once per distinct value and broadcast.
+
+    Display columns (ranks, ratings, shares, rounded downloads) have few
+    distinct values even across millions of rows, and turning numbers into
+    text is the expensive part, so this beats both ``apply`` and pandas
+    string arithmetic by a wide margin.
+    """
+    values = np.asarray(values)
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    if values.dtype == np.float32:
+        # Go via float32's shortest repr so 4.2 prints as 4.2, not 4.199999809265137
+        uniques = [float(str(u)) for u in uniques.astype(np.float32)]
+    return np.array([fn(u) for u in uniques], dtype=object)[codes]
+
+
+def format_number_column(values):
+    """Column version of ``format_number``"""
+    numbers = values.to_numpy(dtype="float64")
+    out = np.empty(len(numbers), dtype=object)
+    billions = numbers >= 1_000_000_000
+    millions = ~billions & (numbers >= 1_000_000)
+    thousands = ~billions & ~millions & (numbers >= 1_000)
+    rest = ~(billions | millions | thousands)
+    # Key on the rounded value so 50,000,001 and 50,000,002 share one string.
+    # Whole-number rounding (rint) agrees with "{:.0f}", but rounding to one
+    # decimal doesn't with "{:.1f}" (1.05e9 would give 1.0B), so billions
+    # are keyed on the raw quotient
+    out[billions] = format_distinct(numbers[billions] / 1_000_000_000, lambda x: f"{x:.1f}B")
+    out[millions] = format_distinct(np.round(numbers[millions] / 1_000_000), lambda x: f"{x:.0f}M")
+    out[thousands] = format_distinct(np.round(numbers[thousands] / 1_000), lambda x: f"{x:.0f}K")
+    out[rest] = format_distinct(values.to_numpy()[rest], str)
+    return pd.Series(out, index=values.index)
+
+
+def rank_change_column(current, last_week):
+    """Column version of ``get_rank_change_indicator``"""
+    # float64 holds missing ranks and history ranks past the sheet's narrowed int dtype
+    change = last_week.astype('float64') - current.astype('float64')
+    return pd.Series(format_distinct(change, lambda c: get_rank_change_indicator(0, c if np.isnan(c) else int(c))),
+                     index=change.index)
+
+
+def build_rankings_table(df_platforms, previous_ranks=None, status=None):
+    """
+    Formatted Platform Rankings table, sorted by current rank.
+
+    ``previous_ranks`` (platform -> rank, e.g. from the history store)
+    overrides the sheet's ``rank_last_week`` for the platforms it covers;
+    ``status`` (aligned with ``df_platforms``) replaces ``threat_level``.
+    """
+    rank_last_week = df_platforms['rank_last_week']
+    if previous_ranks is not None and len(previous_ranks):
+        # Never cast back: history ranks can overflow the sheet column's int8
+        rank_last_week = (df_platforms['platform'].map(previous_ranks).astype('float64')
+                          .fillna(rank_last_week.astype('float64')))
+    table = pd.DataFrame({
+        'rank_current': df_platforms['rank_current'],
+        'change': rank_change_column(df_platforms['rank_current'], rank_last_week),
+        'platform': df_platforms['platform'],
+        'company': df_platforms['company'],
+        'origin': df_platforms['origin'],
+        'downloads_fmt': format_number_column(df_platforms['installs']),
+        'revenue_fmt': format_distinct(df_platforms['revenue_q1_2025'], lambda x: f"${x}M"),
+        'rating_fmt': format_distinct(df_platforms['score'], lambda x: f"{x} ⭐"),
+        'us_share_fmt': format_distinct(df_platforms['us_share'], lambda x: f"{x}%"),
+        'content_count': df_platforms['content_count'],
+        'threat_level': df_platforms['threat_level'] if status is None else status,
+    })
+    table = table.sort_values('rank_current')
+    table.columns = list(RANKINGS_COLUMNS.values())
+    return table
+
+
+def top_n_with_other(df, measure, n, labels, sum_cols=()):
+    """
+    The ``n`` rows with the largest ``measure``, largest first, plus one
+    row rolling up everything else.
+
+    Uses ``nlargest`` (a partial sort) and gets the remainder by
+    subtraction, so the tail is never sorted or copied. ``labels`` maps each
+    label column to its text on the roll-up row, where ``{n}`` is the number
+    of rows folded in; ``measure`` and ``sum_cols`` are summed, other
+    columns are left empty. With ``labels`` None the rest is dropped
+    instead, for measures such as rates that don't add up. With ``n`` None,
+    or no more than ``n`` rows, this is just a descending sort.
+    """
+    if n is None or len(df) <= n:
+        return df.sort_values(measure, ascending=False)
+
+    positions = df[measure].reset_index(drop=True).nlargest(n).index
+    top = df.iloc[positions]
+    if labels is None:
+        return top
+    other = {column: text.format(n=len(df) - n) for column, text in labels.items()}
+    for column in (measure, *sum_cols):
+        other[column] = df[column].sum() - top[column].sum()
+    # Categorical label columns can't hold the new "Other" text
+    top = top.astype({column: "string" for column in labels})
+    return pd.concat([top, pd.DataFrame([other])], ignore_index=True)
+
+
+def kpi_tiles(platforms_cube):
+    """(label, value, delta) for each headline metric tile, from the platforms cube"""
+    total = platforms_cube.total()
+    return [
+        ("Platforms Tracked", total['rows'], "2 new this quarter"),
+        ("Total Downloads", format_number(total['installs']), "+18% MoM"),
+        ("Q1 2025 Revenue", f"${total['revenue_q1_2025']}M", "+380% YoY"),
+        ("Titles in Market", f"{total['content_count']:,}+", "+25% QoQ"),
+        ("Avg Rating", f"{mean(total, 'score'):.2f} ⭐" if total['score_n'] else "—", "+0.1"),
+    ]
+
+
+def genre_counts(titles_cube):
+    """Title count per genre"""
+    return titles_cube.rollup('genre')[['genre', 'rows']].rename(columns={'rows': 'count'})
+
+
+def content_breakdown(titles_cube, counts):
+    """(label, value) lines shown under the genre mix chart"""
+    total = titles_cube.total()
+    if not total['rows']:
+        return [("Avg Episodes", "—"), ("Avg Revenue", "—"), ("Top Genre", "—")]
+    return [
+        ("Avg Episodes", f"{mean(total, 'episodes'):.0f}"),
+        ("Avg Revenue", f"${mean(total, 'revenue_est'):.1f}M"),
+        # Titles with a blank genre count towards the totals but not ``counts``
+        ("Top Genre", "—" if counts.empty else counts.loc[counts['count'].idxmax(), 'genre']),
+    ]
+
+
+TITLE_BREAKDOWN_COLUMNS = {
+    'rows': 'Titles',
+    'revenue_est': 'Revenue ($M)',
+    'views_est': 'Views',
+    'avg_episodes': 'Avg Episodes',
+}
+
+
+def title_breakdown(titles_cube, dimensions):
+    """Titles cube rolled up to ``dimensions`` for the drill-down table, by revenue"""
+    table = titles_cube.rollup(*dimensions)
+    table['avg_episodes'] = mean(table, 'episodes')
+    table = table.sort_values('revenue_est', ascending=False)
+    return table[[*dimensions, *TITLE_BREAKDOWN_COLUMNS]].rename(columns=TITLE_BREAKDOWN_COLUMNS)
+
+
+def table_page(df, page, page_rows):
+    """
+    Rows of ``page`` (1-based) of ``df``, ready to send to the browser.
+
+    Categorical columns keep only the categories on the page: Arrow ships a
+    column's whole category list with every slice of it, so a 500-row page
+    of a 100k-platform table would otherwise carry all 100k names.
+    """
+    start = (page - 1) * page_rows
+    rows = df.iloc[start:start + page_rows]
+    categorical = [column for column, dtype in rows.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)]
+    if not categorical:
+        return rows
+    return rows.assign(**{column: rows[column].cat.remove_unused_categories() for column in categorical})